@@ -1,4 +1,40 @@
 
 export const API_BASE = "http://localhost:5001";
 
-export default API_BASE;
\ No newline at end of file
+// List endpoints are cursor-paginated: each page carries the cursor for the
+// next one in the X-Next-Cursor header.
+
+// One page of a list endpoint; pass the previous page's nextCursor to get the
+// next one. Use this for lists that grow without bound (scores, results).
+export async function fetchPage(url, cursor = null, options = {}) {
+  const pageUrl = cursor ? `${url}${url.includes('?') ? '&' : '?'}cursor=${encodeURIComponent(cursor)}` : url;
+  const response = await fetch(pageUrl, options);
+  return { response, nextCursor: response.headers.get('X-Next-Cursor') };
+}
+
+// Follows every cursor and returns a single Response whose body merges every
+// page, so callers can use it exactly like fetch(). Object bodies are merged
+// on their `listKey` array. Only for small lookup lists (subjects, chapters,
+// quizzes for dropdowns).
+export async function fetchAllPages(url, options = {}, listKey = null) {
+  let merged = null;
+  let cursor = null;
+  do {
+    const pageUrl = cursor ? `${url}${url.includes('?') ? '&' : '?'}cursor=${encodeURIComponent(cursor)}` : url;
+    const response = await fetch(pageUrl, options);
+    if (!response.ok) return response;
+    const data = await response.json();
+    if (merged === null) {
+      merged = data;
+    } else if (listKey) {
+      merged[listKey] = merged[listKey].concat(data[listKey]);
+    } else {
+      merged = merged.concat(data);
+    }
+    cursor = response.headers.get('X-Next-Cursor');
+  } while (cursor);
+  if (listKey) merged.next_cursor = null;
+  return new Response(JSON.stringify(merged), { status: 200, headers: { 'Content-Type': 'application/json' } });
+}
+
+export default API_BASE;
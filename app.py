@@ -1,12 +1,15 @@
-from flask import Flask, send_from_directory
+from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_mail import Mail
 from flask_wtf import CSRFProtect
 from flask_cors import CORS
 from config import Config
-import os
 from models import db
+from database import configure_engine, engine_options
+from json_provider import init_json
+from metrics import init_metrics
+from passwords import init_passwords
 
 
 login_manager = LoginManager()
@@ -16,24 +19,33 @@ csrf = CSRFProtect()
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
+    init_json(app)
+    init_passwords(app)
 
     
     db.init_app(app)
-    print(f"DEBUG: db.init_app(app) called. app is {app}")
-    
+    configure_engine(app, db)
+    init_metrics(app, db)
+
     login_manager.init_app(app)
     mail.init_app(app)
 
-    CORS(app, origins=["http://localhost:5173"], supports_credentials=True)
-    print("DEBUG: CORS extension initialized successfully with specific origins.")
+    CORS(app, origins=["http://localhost:5173"], supports_credentials=True, expose_headers=["X-Next-Cursor"])
 
     
     from routes import api as api_blueprint
     
     app.register_blueprint(api_blueprint, url_prefix='/api')
 
-    @app.route('/exports/<filename>')
-    def download_export(filename):
-        return send_from_directory(os.path.join(app.root_path, 'exports'), filename, as_attachment=True)
+    from commands import register_commands
+    register_commands(app)
+
+    return app
+
 
-    return app
\ No newline at end of file
+def reset_connections(app):
+    """Drop database and Redis connections inherited from a parent process after fork."""
+    with app.app_context():
+        db.engine.dispose(close=False)
+    app.extensions.pop('redis', None)
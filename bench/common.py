@@ -0,0 +1,128 @@
+"""Shared setup for the scripts in bench/.
+
+Scripts run from the repository root (``python bench/sqlite_profile.py``)
+against throwaway SQLite files and fakeredis, so they need no services.
+``Config`` reads the environment at import time, which is why ``configure``
+must be called before anything from the app is imported.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Seeding thousands of users with the production scrypt cost would dominate the run
+FAST_HASH = 'pbkdf2:sha256:1'
+PASSWORD = 'bench-password'
+
+
+def configure(**env):
+    """Set the app's environment for this run.
+
+    Keyword arguments override the defaults below; ``None`` leaves a setting
+    to the shell environment or ``Config``.
+    """
+    settings = {
+        'REDIS_URL': 'fakeredis://',
+        'METRICS_ENABLED': 'false',
+        'PASSWORD_HASH_WORKERS': '0',
+        'PASSWORD_HASH_METHOD': FAST_HASH,
+    }
+    settings.update(env)
+    os.environ.update({key: str(value) for key, value in settings.items() if value is not None})
+
+
+def temp_database(name='bench'):
+    return os.path.join(tempfile.mkdtemp(prefix='quiz-bench-'), f'{name}.db')
+
+
+def make_app(database_path, **overrides):
+    """A fresh app on ``database_path`` with ``Config`` attributes overridden; schema upgraded."""
+    from app import create_app
+    from config import Config
+    from migrations import upgrade
+
+    overrides['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{database_path}'
+    saved = {key: getattr(Config, key) for key in overrides}
+    for key, value in overrides.items():
+        setattr(Config, key, value)
+    try:
+        app = create_app()
+    finally:
+        for key, value in saved.items():
+            setattr(Config, key, value)
+    with app.app_context():
+        upgrade()
+    return app
+
+
+def seed(app, users=10, quizzes=10, questions=5, password_method=FAST_HASH):
+    """Bulk-insert users ``user<i>@bench.test`` (password ``PASSWORD``) and quizzes with questions."""
+    from sqlalchemy import insert
+    from werkzeug.security import generate_password_hash
+
+    from models import db, User, Subject, Chapter, Quiz, Question
+
+    password = generate_password_hash(PASSWORD, password_method)
+    with app.app_context():
+        if users:
+            db.session.execute(insert(User), [
+                {'email': f'user{i}@bench.test', 'password': password, 'full_name': f'Bench User {i}', 'role': 'user'}
+                for i in range(users)
+            ])
+        subject = Subject(name='Bench Subject', description='Seeded by bench/common.py')
+        db.session.add(subject)
+        db.session.flush()
+        chapter = Chapter(name='Bench Chapter', subject_id=subject.id)
+        db.session.add(chapter)
+        db.session.flush()
+        for i in range(quizzes):
+            quiz = Quiz(name=f'Bench Quiz {i}', chapter_id=chapter.id, time_duration='10')
+            db.session.add(quiz)
+            db.session.flush()
+            db.session.execute(insert(Question), [
+                {'quiz_id': quiz.id, 'question_statement': f'Question {j}', 'option1': 'a', 'option2': 'b',
+                 'option3': 'c', 'option4': 'd', 'correct_option': 'a'}
+                for j in range(questions)
+            ])
+        db.session.commit()
+        return [quiz.id for quiz in Quiz.query.order_by(Quiz.id)]
+
+
+def login(client, email, password=PASSWORD):
+    response = client.post('/api/login', json={'email': email, 'password': password})
+    if response.status_code != 200:
+        raise RuntimeError(f"Login as {email} failed: {response.status_code} {response.data!r}")
+
+
+def best_of(fn, repeat=5):
+    """The fastest of ``repeat`` calls to ``fn``, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def percentile(values, pct):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def median(values):
+    return statistics.median(values) if values else float('nan')
+
+
+def print_table(headers, rows):
+    rows = [[f'{cell:.2f}' if isinstance(cell, float) else str(cell) for cell in row] for row in rows]
+    widths = [max(len(str(header)), *(len(row[i]) for row in rows)) for i, header in enumerate(headers)]
+    print('  '.join(str(header).ljust(width) for header, width in zip(headers, widths)))
+    print('  '.join('-' * width for width in widths))
+    for row in rows:
+        print('  '.join(cell.ljust(width) for cell, width in zip(row, widths)))
@@ -0,0 +1,88 @@
+"""Logins per second at different PASSWORD_HASH_WORKERS pool sizes.
+
+Client threads stand in for one gunicorn worker's gthread threads and log
+in repeatedly with the configured PASSWORD_HASH_METHOD (scrypt by default).
+A probe thread hits the cheap /api/me route meanwhile. Its latency shows
+how much hashing stalls the rest of the worker. Pool size 0 hashes inline
+on the request thread, as login did before passwords.py.
+
+    python bench/hashing_pool.py --threads 8 --pools 0,1,2,4 --seconds 5
+"""
+import argparse
+import logging
+import threading
+import time
+
+from common import PASSWORD, configure, make_app, percentile, print_table, seed, temp_database
+
+configure(PASSWORD_HASH_METHOD=None)
+
+
+def run(app, threads, seconds):
+    logins, busy, probe = [], [0], []
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def client_thread(index):
+        client = app.test_client()
+        body = {'email': f'user{index}@bench.test', 'password': PASSWORD}
+        count = rejected = 0
+        while not stop.is_set():
+            status = client.post('/api/login', json=body).status_code
+            if status == 200:
+                count += 1
+            elif status == 503:
+                rejected += 1
+            else:
+                raise RuntimeError(f"Login failed with {status}")
+        with lock:
+            logins.append(count)
+            busy[0] += rejected
+
+    def probe_thread():
+        client = app.test_client()
+        while not stop.is_set():
+            start = time.perf_counter()
+            client.get('/api/me')
+            probe.append(time.perf_counter() - start)
+            time.sleep(0.01)
+
+    workers = [threading.Thread(target=client_thread, args=(i,)) for i in range(threads)]
+    workers.append(threading.Thread(target=probe_thread))
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(logins) / seconds, busy[0], percentile(probe, 50) * 1000, percentile(probe, 95) * 1000
+
+
+def main():
+    import passwords
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--pools', default='0,1,2,4', help='comma-separated PASSWORD_HASH_WORKERS values')
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+
+    rows = []
+    for workers in [int(size) for size in args.pools.split(',')]:
+        app = make_app(temp_database(), PASSWORD_HASH_WORKERS=workers,
+                       PASSWORD_HASH_MAX_PENDING=max(args.threads, 1))
+        app.logger.setLevel(logging.CRITICAL)
+        seed(app, users=args.threads, quizzes=0, password_method=app.config['PASSWORD_HASH_METHOD'])
+        # Start the pool's processes outside the measured window
+        with app.app_context():
+            passwords.hash_password(PASSWORD)
+        rate, rejected, probe_p50, probe_p95 = run(app, args.threads, args.seconds)
+        passwords.shutdown()
+        rows.append([workers or 'inline', rate, rejected, probe_p50, probe_p95])
+
+    print(f"{args.threads} client threads, {args.seconds:g}s per pool size")
+    print_table(['hash workers', 'logins/s', '503 busy', '/api/me p50 ms', '/api/me p95 ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""JSON encoding and response compression on representative API payloads.
+
+Payloads are built with the same queries and serializers as the routes:
+a page of the quiz catalog, a page of score history, an attempt payload
+and admin search results. Each is encoded with the stdlib provider (the
+Flask default the routes used before json_provider.py) and with orjson.
+It is then compressed the way compress_response does: gzip at
+COMPRESS_LEVEL and brotli at COMPRESS_BROTLI_QUALITY.
+
+    python bench/json_compression.py --rows 200 --questions 50
+"""
+import argparse
+import gzip
+import uuid
+from datetime import datetime, timedelta
+
+from common import best_of, configure, make_app, print_table, seed, temp_database
+
+configure()
+
+
+def build_payloads(app, rows, questions):
+    from sqlalchemy import insert
+
+    from models import db, Quiz, Question, Score
+    from queries import quiz_detail_query, score_history_query
+    from search import fts_search
+    from serializers import serialize_history_row, serialize_quizzes
+
+    quiz_ids = seed(app, users=1, quizzes=rows, questions=1)
+    with app.app_context():
+        db.session.execute(insert(Question), [
+            {'quiz_id': quiz_ids[0], 'question_statement': f'Which option completes statement {j}? ' * 3,
+             'option1': f'First option {j}', 'option2': f'Second option {j}',
+             'option3': f'Third option {j}', 'option4': f'Fourth option {j}', 'correct_option': 'a'}
+            for j in range(questions - 1)
+        ])
+        start = datetime(2024, 1, 1)
+        db.session.execute(insert(Score), [
+            {'attempt_id': uuid.uuid4().hex, 'quiz_id': quiz_ids[i % len(quiz_ids)], 'user_id': 1,
+             'time_stamp_of_attempt': start + timedelta(minutes=i), 'total_scored': i % 10, 'total_possible': 10}
+            for i in range(rows)
+        ])
+        db.session.commit()
+
+        quiz = db.session.get(Quiz, quiz_ids[0])
+        question_rows = Question.query.filter_by(quiz_id=quiz.id).order_by(Question.id)
+        return {
+            f'quiz catalog ({rows} rows)': {
+                'quizzes': serialize_quizzes(quiz_detail_query().order_by(Quiz.id).limit(rows)),
+                'next_cursor': None,
+            },
+            f'score history ({rows} rows)': [
+                serialize_history_row(row) for row in score_history_query(1).limit(rows)
+            ],
+            f'attempt payload ({questions} questions)': {
+                'quiz_id': quiz.id, 'quiz_name': quiz.name, 'time_duration': quiz.time_duration,
+                'questions': [{
+                    'id': q.id, 'quiz_id': q.quiz_id, 'question_statement': q.question_statement,
+                    'options': [q.option1, q.option2, q.option3, q.option4],
+                } for q in question_rows],
+            },
+            'admin search (bench)': fts_search('bench', 100),
+        }
+
+
+def main():
+    import brotli
+
+    from json_provider import OrjsonProvider, StdlibJSONProvider
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--questions', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=200, help='encodes per timing')
+    args = parser.parse_args()
+
+    app = make_app(temp_database())
+    config = app.config
+    stdlib, fast = StdlibJSONProvider(app), OrjsonProvider(app)
+    per_call = 1000 / args.repeat
+
+    def timed(fn):
+        return best_of(lambda: [fn() for _ in range(args.repeat)]) * per_call
+
+    rows = []
+    for name, payload in build_payloads(app, args.rows, args.questions).items():
+        body = fast.dumps_bytes(payload)
+        gzipped = gzip.compress(body, compresslevel=config['COMPRESS_LEVEL'], mtime=0)
+        brotlied = brotli.compress(body, quality=config['COMPRESS_BROTLI_QUALITY'])
+        rows.append([
+            name,
+            timed(lambda: stdlib.dumps(payload).encode('utf-8')),
+            timed(lambda: fast.dumps_bytes(payload)),
+            len(body),
+            len(gzipped),
+            timed(lambda: gzip.compress(body, compresslevel=config['COMPRESS_LEVEL'], mtime=0)),
+            len(brotlied),
+            timed(lambda: brotli.compress(body, quality=config['COMPRESS_BROTLI_QUALITY'])),
+        ])
+
+    print(f"ms per call (best of 5 x {args.repeat}); gzip level {config['COMPRESS_LEVEL']}, "
+          f"brotli quality {config['COMPRESS_BROTLI_QUALITY']}")
+    print_table(['payload', 'stdlib ms', 'orjson ms', 'bytes', 'gzip bytes', 'gzip ms', 'br bytes', 'br ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
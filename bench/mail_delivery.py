@@ -0,0 +1,111 @@
+"""Messages per second delivered to a local SMTP stand-in (aiosmtpd).
+
+Compares one SMTP connection per message (how the reminder and report
+tasks sent mail before mailer.py), ``send_batch`` with one connection per
+MAIL_BATCH_SIZE messages, and several batches in parallel as separate
+Celery workers would send them. ``--handshake-ms`` delays the server's EHLO
+reply to stand in for the TCP and TLS setup a real relay costs on every
+new connection.
+
+    python bench/mail_delivery.py --messages 500 --batch-size 50 --parallel 4 --handshake-ms 50
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from common import configure, make_app, print_table, temp_database
+
+configure(MAIL_SERVER='127.0.0.1', MAIL_USE_TLS='false', MAIL_USERNAME='', MAIL_PASSWORD='')
+
+
+class CountingHandler:
+    def __init__(self, handshake_delay):
+        self.handshake_delay = handshake_delay
+        self.received = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        await asyncio.sleep(self.handshake_delay)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return '250 Message accepted for delivery'
+
+
+def messages(count):
+    from mailer import build_message
+    return [build_message('Quiz Master Daily Reminder', f'user{i}@bench.test', 'noreply@bench.test',
+                          body='Just a friendly reminder to visit Quiz Master!\n' * 10)
+            for i in range(count)]
+
+
+def one_connection_per_message(mail, batch, rate):
+    from flask_mail import Message
+    for message in batch:
+        msg = Message(message['subject'], sender=message['sender'], recipients=[message['recipient']])
+        msg.body = message['body']
+        mail.send(msg)
+    return []
+
+
+def main():
+    from aiosmtpd.controller import Controller
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--messages', type=int, default=500)
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--parallel', type=int, default=4, help='concurrent deliver_mail_batch tasks')
+    parser.add_argument('--rate', type=float, default=0, help='MAIL_SEND_RATE, shared by all tasks (0 = unlimited)')
+    parser.add_argument('--handshake-ms', type=float, default=50)
+    parser.add_argument('--port', type=int, default=8025)
+    args = parser.parse_args()
+
+    from app import mail
+    from mailer import iter_batches, send_batch
+
+    handler = CountingHandler(args.handshake_ms / 1000)
+    controller = Controller(handler, hostname='127.0.0.1', port=args.port)
+    controller.start()
+    app = make_app(temp_database(), MAIL_PORT=args.port)
+
+    def deliver(send, threads):
+        batches = list(iter_batches(messages(args.messages), args.batch_size))
+        failed = []
+
+        def worker(assigned):
+            with app.app_context():
+                for batch in assigned:
+                    failed.extend(send(mail, batch, args.rate))
+
+        workers = [threading.Thread(target=worker, args=(batches[i::threads],)) for i in range(threads)]
+        before = handler.received
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        return handler.received - before, len(failed), elapsed
+
+    runs = [
+        ('connection per message', one_connection_per_message, 1),
+        (f'send_batch, {args.batch_size} per connection', send_batch, 1),
+        (f'send_batch, {args.parallel} tasks in parallel', send_batch, args.parallel),
+    ]
+    rows = []
+    try:
+        for name, send, threads in runs:
+            delivered, failed, elapsed = deliver(send, threads)
+            rows.append([name, delivered, failed, elapsed, delivered / elapsed])
+    finally:
+        controller.stop()
+
+    print(f"{args.messages} messages, {args.handshake_ms:g} ms connection setup, "
+          f"send rate {args.rate:g}/s across all tasks (0 = unlimited)")
+    print_table(['delivery', 'delivered', 'failed', 'seconds', 'messages/s'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Admin search latency: the FTS5 index against the ``ilike`` scan it replaced.
+
+Seeds ``--users`` users with varied names plus quizzes and runs a few
+representative queries three ways. ``fts_search`` is what /api/admin/search
+uses on SQLite. ``like_search`` is the fallback. The unbounded LIKE matches
+the original admin_search, which returned every matching row.
+
+    python bench/search_index.py --users 100000
+"""
+import argparse
+
+from common import best_of, configure, make_app, print_table, seed, temp_database
+
+configure()
+
+FIRST = ['Aarav', 'Alice', 'Bilal', 'Chen', 'Diya', 'Elena', 'Farah', 'Gopal', 'Hana', 'Ishaan',
+         'Jonas', 'Kavya', 'Liam', 'Meera', 'Nikhil', 'Olga', 'Priya', 'Quinn', 'Rahul', 'Sara']
+LAST = ['Sharma', 'Smith', 'Iyer', 'Khan', 'Garcia', 'Nakamura', 'Okafor', 'Petrov', 'Reddy', 'Silva',
+        'Tanaka', 'Usman', 'Verma', 'Wang', 'Xu', 'Yadav', 'Zhou', 'Menon', 'Bose', 'Das']
+
+QUERIES = [
+    ('common prefix', 'pri'),
+    ('full name', 'meera okafor'),
+    ('email fragment', 'user4242'),
+    ('no match', 'zzzzqx'),
+]
+
+
+def seed_users(app, count):
+    from sqlalchemy import insert
+    from werkzeug.security import generate_password_hash
+
+    from common import FAST_HASH, PASSWORD
+    from models import db, User
+
+    password = generate_password_hash(PASSWORD, FAST_HASH)
+    with app.app_context():
+        for start in range(0, count, 10000):
+            db.session.execute(insert(User), [
+                {'email': f'user{i}@bench.test', 'password': password, 'role': 'user',
+                 'full_name': f'{FIRST[i % len(FIRST)]} {LAST[(i // len(FIRST)) % len(LAST)]} {i}'}
+                for i in range(start, min(start + 10000, count))
+            ])
+        db.session.commit()
+
+
+def main():
+    from models import db
+    from search import DEFAULT_LIMIT, fts_search, like_search, search_index_ready
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--quizzes', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = make_app(temp_database())
+    seed(app, users=0, quizzes=args.quizzes, questions=1)
+    seed_users(app, args.users)
+
+    rows = []
+    with app.app_context():
+        if not search_index_ready():
+            raise SystemExit("This SQLite build has no FTS5; only the LIKE search is available.")
+        db.session.execute(db.text('ANALYZE'))
+        for label, query in QUERIES:
+            hits = fts_search(query, DEFAULT_LIMIT)
+            timings = [
+                best_of(lambda: fts_search(query, DEFAULT_LIMIT), args.repeat),
+                best_of(lambda: like_search(query, DEFAULT_LIMIT), args.repeat),
+                best_of(lambda: like_search(query, None), args.repeat),
+            ]
+            rows.append([f'{label} ({query!r})', sum(len(v) for v in hits.values())]
+                        + [t * 1000 for t in timings])
+
+    print(f"{args.users} users, {args.quizzes} quizzes, best of {args.repeat}, limit {DEFAULT_LIMIT} per entity")
+    print_table(['query', 'fts hits', 'fts ms', 'like (limited) ms', 'like (unbounded) ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
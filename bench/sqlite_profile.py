@@ -0,0 +1,95 @@
+"""Concurrent quiz submissions and reads under different SQLite engine profiles.
+
+Writer threads submit quizzes while reader threads page through score
+history, all through the real routes. Each profile gets its own database
+file. The first profile is what the app ran with before database.py
+existed: rollback journal, full sync and no busy timeout. Failed requests
+are mostly "database is locked" errors.
+
+    python bench/sqlite_profile.py --writers 8 --readers 8 --seconds 5
+"""
+import argparse
+import logging
+import threading
+import time
+
+from common import configure, login, make_app, percentile, print_table, seed, temp_database
+
+configure()
+
+PROFILES = [
+    ('rollback journal, no timeout', {
+        'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL',
+        'SQLITE_BUSY_TIMEOUT_MS': 0, 'SQLITE_MMAP_SIZE': 0,
+    }),
+    ('rollback journal + busy_timeout', {
+        'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL',
+        'SQLITE_BUSY_TIMEOUT_MS': 5000, 'SQLITE_MMAP_SIZE': 0,
+    }),
+    ('WAL profile (Config defaults)', {}),
+]
+
+
+def run_profile(overrides, writers, readers, seconds):
+    app = make_app(temp_database(), **overrides)
+    app.logger.setLevel(logging.CRITICAL)
+    quiz_ids = seed(app, users=writers + readers, quizzes=20)
+
+    deadline = time.perf_counter() + seconds
+    results = {'submit': [], 'read': [], 'errors': 0}
+    lock = threading.Lock()
+    ready = threading.Barrier(writers + readers)
+
+    def worker(index, write):
+        client = app.test_client()
+        login(client, f'user{index}@bench.test')
+        answers = {'1': 'a', '2': 'b'}
+        timings, errors, i = [], 0, 0
+        ready.wait()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            if write:
+                response = client.post(f'/api/quizzes/{quiz_ids[i % len(quiz_ids)]}/submit',
+                                       json={'answers': answers})
+            else:
+                response = client.get('/api/user/scores?limit=20')
+            if response.status_code < 400:
+                timings.append(time.perf_counter() - start)
+            else:
+                errors += 1
+            i += 1
+        with lock:
+            results['submit' if write else 'read'].extend(timings)
+            results['errors'] += errors
+
+    threads = [threading.Thread(target=worker, args=(i, i < writers)) for i in range(writers + readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+
+    rows = []
+    for name, overrides in PROFILES:
+        results = run_profile(overrides, args.writers, args.readers, args.seconds)
+        rows.append([
+            name,
+            len(results['submit']) / args.seconds,
+            len(results['read']) / args.seconds,
+            percentile(results['submit'], 95) * 1000,
+            results['errors'],
+        ])
+    print(f"{args.writers} writers, {args.readers} readers, {args.seconds:g}s per profile")
+    print_table(['profile', 'submits/s', 'reads/s', 'submit p95 ms', 'failed requests'], rows)
+
+
+if __name__ == '__main__':
+    main()
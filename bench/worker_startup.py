@@ -0,0 +1,58 @@
+"""Cold-start cost of a Celery worker or beat process, measured in fresh interpreters.
+
+``import tasks`` is what every worker, beat and web process pays before
+doing anything. It no longer builds a Flask app. A worker builds one app
+on its first task (``celery_app.get_flask_app``). Before celery_app.py,
+celery.py and tasks.py each called ``create_app()`` at import time. The
+"eager" row reproduces that: two apps built during the import.
+
+    python bench/worker_startup.py --repeat 10
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+from common import ROOT, configure, median, print_table, temp_database
+
+configure(DATABASE_URL=f'sqlite:///{temp_database()}')
+
+SCENARIOS = [
+    ('import tasks (beat, web)', 'import tasks'),
+    ('import tasks + first task app (worker)', 'import tasks, celery_app; celery_app.get_flask_app()'),
+    ('eager: create_app() in celery.py and tasks.py (before)',
+     'import tasks; from app import create_app; create_app(); create_app()'),
+]
+
+TIMER = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def cold_start(statement):
+    result = subprocess.run(
+        [sys.executable, '-c', TIMER.format(statement=statement)],
+        cwd=ROOT, env=os.environ, capture_output=True, text=True, check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    rows = []
+    for label, statement in SCENARIOS:
+        timings = [cold_start(statement) for _ in range(args.repeat)]
+        rows.append([label, median(timings) * 1000, min(timings) * 1000])
+
+    print(f"Time spent in the statement, median and best of {args.repeat} fresh interpreters")
+    print_table(['startup', 'median ms', 'best ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import threading
+from collections import OrderedDict
+
+
+class VersionedCache:
+    """Small process-local LRU cache whose entries are tied to a version.
+
+    Callers pass the current version of the underlying data (e.g.
+    ``Quiz.cache_version``) on every lookup; an entry stored for any other
+    version is treated as a miss, so bumping the version in the database
+    invalidates the entry in every worker process without any messaging.
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, version, value):
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_build(self, key, version, builder):
+        value = self.get(key, version)
+        if value is None:
+            value = builder()
+            self.set(key, version, value)
+        return value
@@ -0,0 +1,68 @@
+"""The one Celery application for web processes, workers and beat.
+
+Settings, including the broker and ``beat_schedule``, come only from
+celeryconfig.py. The Flask app is not built at import time: a task creates
+it on first run in each worker process (or uses the current app when
+called eagerly inside a request), so importing tasks is cheap and beat
+never builds an app at all. Run workers with ``celery -A celery_app worker``.
+"""
+import time
+
+from celery import Celery, Task
+from celery.signals import task_postrun, task_prerun, worker_process_init
+from flask import has_app_context
+
+
+_flask_app = None
+
+
+def get_flask_app():
+    global _flask_app
+    if _flask_app is None:
+        from app import create_app
+        _flask_app = create_app()
+    return _flask_app
+
+
+class FlaskTask(Task):
+    """Runs the task body inside a Flask application context."""
+
+    def __call__(self, *args, **kwargs):
+        if has_app_context():
+            return super().__call__(*args, **kwargs)
+        with get_flask_app().app_context():
+            return super().__call__(*args, **kwargs)
+
+
+celery = Celery('quizmaster', task_cls=FlaskTask)
+celery.config_from_object('celeryconfig')
+
+
+@worker_process_init.connect
+def reset_connections_after_fork(**kwargs):
+    # A pool child must not reuse connections opened before the fork
+    if _flask_app is not None:
+        from app import reset_connections
+        reset_connections(_flask_app)
+
+
+_task_started = {}
+
+
+@task_prerun.connect
+def start_task_timer(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def record_task_duration(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is None:
+        return
+    from metrics import record_task
+    elapsed = time.perf_counter() - started
+    if has_app_context():
+        record_task(task.name, state, elapsed)
+    else:
+        with get_flask_app().app_context():
+            record_task(task.name, state, elapsed)
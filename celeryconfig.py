@@ -1,12 +1,72 @@
 from celery.schedules import crontab
+from kombu import Queue
 
+from config import Config
 
-broker_url = 'redis://localhost:6379/0'
-result_backend = 'redis://localhost:6379/0'
+
+broker_url = Config.CELERY_BROKER_URL
+result_backend = Config.CELERY_RESULT_BACKEND
 
 #  modules to import when the Celery worker starts.
 imports = ('tasks',) 
 
+# --- Queues and routing ---
+# Each workload class has its own queue so a monthly mail-out or a large
+# export never sits in front of per-submission mail. Listed in priority
+# order: a worker consuming several queues drains earlier ones first.
+task_queues = (
+    Queue('realtime_mail'),
+    Queue('bulk_mail'),
+    Queue('exports'),
+    Queue('analytics'),
+)
+task_default_queue = 'analytics'
+broker_transport_options = {'queue_order_strategy': 'priority'}
+
+task_routes = {
+    'tasks.send_score_email': {'queue': 'realtime_mail'},
+    'tasks.send_daily_reminders': {'queue': 'bulk_mail'},
+    'tasks.generate_monthly_report': {'queue': 'bulk_mail'},
+    'tasks.deliver_mail_batch': {'queue': 'bulk_mail'},
+    'tasks.export_scores_job': {'queue': 'exports'},
+    'tasks.rebuild_leaderboards': {'queue': 'analytics'},
+    'tasks.flush_pending_scores': {'queue': 'analytics'},
+}
+
+# Per-task limits. acks_late (with redelivery if the worker dies) is only
+# enabled for tasks that are safe to run twice; mail tasks ack on receipt so
+# a crash can't resend a batch.
+task_annotations = {
+    'tasks.send_score_email': {'rate_limit': '20/s', 'soft_time_limit': 30, 'time_limit': 60},
+    'tasks.send_daily_reminders': {'soft_time_limit': 600, 'time_limit': 660},
+    'tasks.generate_monthly_report': {'soft_time_limit': 1800, 'time_limit': 1860},
+    'tasks.deliver_mail_batch': {'rate_limit': '30/m', 'soft_time_limit': 300, 'time_limit': 360},
+    'tasks.export_scores_job': {
+        'acks_late': True, 'reject_on_worker_lost': True, 'soft_time_limit': 3600, 'time_limit': 3660
+    },
+    'tasks.rebuild_leaderboards': {
+        'acks_late': True, 'reject_on_worker_lost': True, 'soft_time_limit': 600, 'time_limit': 660
+    },
+    'tasks.flush_pending_scores': {
+        'acks_late': True, 'reject_on_worker_lost': True, 'soft_time_limit': 50, 'time_limit': 60
+    },
+}
+
+# Worker profiles started by worker.py. Prefetching is per worker, so
+# short realtime tasks prefetch a few messages while long-running queues
+# take one at a time and leave the rest for idle workers.
+WORKER_PROFILES = {
+    'realtime': {'queues': ['realtime_mail'], 'concurrency': 4, 'prefetch_multiplier': 4},
+    'bulk': {'queues': ['bulk_mail'], 'concurrency': 2, 'prefetch_multiplier': 1},
+    'exports': {'queues': ['exports'], 'concurrency': 2, 'prefetch_multiplier': 1},
+    'analytics': {'queues': ['analytics'], 'concurrency': 2, 'prefetch_multiplier': 1},
+    # Everything in one worker, for small deployments
+    'all': {
+        'queues': ['realtime_mail', 'bulk_mail', 'exports', 'analytics'],
+        'concurrency': 4, 'prefetch_multiplier': 1
+    },
+}
+
 # scheduled tasks
 beat_schedule = {
     'daily-inactive-user-reminder': {
@@ -21,4 +81,12 @@ beat_schedule = {
     },
 }
 
+# After turning write-behind off, drain what's left with `flask flush-scores`
+if Config.SCORE_WRITE_BEHIND:
+    beat_schedule['flush-pending-scores'] = {
+        'task': 'tasks.flush_pending_scores',
+        'schedule': Config.SCORE_FLUSH_INTERVAL,
+        'args': ()
+    }
+
 timezone = 'Asia/Kolkata' 
\ No newline at end of file
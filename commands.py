@@ -0,0 +1,106 @@
+from datetime import datetime
+
+import click
+from flask import current_app
+from redis.exceptions import RedisError
+
+from leaderboard import rebuild_leaderboards
+from migrations import upgrade
+from models import db, User
+from passwords import hash_password
+from score_queue import flush_pending_scores
+from search import rebuild_search_index
+from stats import rebuild_quiz_stats
+
+
+def ensure_admin(email, password):
+    """Create the admin account unless it exists; returns True if it was created."""
+    if User.query.filter_by(email=email, role='admin').first():
+        return False
+    db.session.add(User(
+        email=email,
+        password=hash_password(password),
+        full_name='Quiz Master Admin',
+        qualification='Administrator',
+        dob=datetime(2000, 1, 1),
+        role='admin'
+    ))
+    db.session.commit()
+    return True
+
+
+def _upgrade_db():
+    applied = upgrade()
+    if applied:
+        for change in applied:
+            click.echo(f"Applied {change}")
+    else:
+        click.echo("Database is up to date.")
+
+
+def _create_admin():
+    email = current_app.config['ADMIN_EMAIL']
+    if ensure_admin(email, current_app.config['ADMIN_PASSWORD']):
+        click.echo(f"Admin user '{email}' created with the configured password. PLEASE CHANGE IT!")
+    else:
+        click.echo(f"Admin user '{email}' already exists.")
+
+
+def _rebuild_leaderboards():
+    boards = rebuild_leaderboards()
+    if boards is None:
+        click.echo("A leaderboard rebuild is already running; skipped.")
+    else:
+        click.echo(f"Rebuilt {boards} leaderboards.")
+
+
+def register_commands(app):
+    @app.cli.command('upgrade-db')
+    def upgrade_db():
+        """Create or upgrade the database schema in place."""
+        _upgrade_db()
+
+    @app.cli.command('create-admin')
+    def create_admin():
+        """Create the ADMIN_EMAIL admin account if it doesn't exist."""
+        _create_admin()
+
+    @app.cli.command('setup-db')
+    def setup_db():
+        """Deploy step: upgrade the schema, bootstrap the admin account and rebuild the leaderboards."""
+        _upgrade_db()
+        _create_admin()
+        try:
+            _rebuild_leaderboards()
+        except RedisError as e:
+            click.echo(f"Skipped rebuilding leaderboards, Redis is unavailable: {e}", err=True)
+
+    @app.cli.command('rebuild-search-index')
+    def rebuild_search_index_command():
+        """Recreate and repopulate the admin full-text search index."""
+        with db.engine.begin() as connection:
+            if rebuild_search_index(connection):
+                click.echo("Search index rebuilt.")
+            else:
+                click.echo("FTS5 is not available on this database; search uses LIKE.")
+
+    @app.cli.command('rebuild-quiz-stats')
+    def rebuild_quiz_stats_command():
+        """Recompute per-quiz statistics from the Score table."""
+        with db.engine.begin() as connection:
+            rebuild_quiz_stats(connection)
+        click.echo("Quiz statistics rebuilt.")
+
+    @app.cli.command('rebuild-leaderboards')
+    def rebuild_leaderboards_command():
+        """Repopulate the Redis leaderboards from the Score table."""
+        try:
+            _rebuild_leaderboards()
+        except RedisError as e:
+            raise click.ClickException(f"Redis is unavailable: {e}")
+
+    @app.cli.command('flush-scores')
+    def flush_scores_command():
+        """Write every queued write-behind score to the database."""
+        flushed = flush_pending_scores()
+        click.echo(f"Flushed {flushed} scores.")
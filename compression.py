@@ -0,0 +1,57 @@
+"""Negotiated response compression for the API.
+
+Bodies of compressible types above ``COMPRESS_MIN_SIZE`` bytes are sent
+brotli-encoded when the client accepts ``br`` and the optional ``brotli``
+package is installed, gzip-encoded otherwise. Streamed responses and file
+downloads are left alone (the score export stream compresses itself).
+A strong ETag is weakened, since the encoded body is no longer the
+representation it was computed for; If-None-Match still matches it.
+"""
+import gzip
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/javascript', 'text/csv', 'text/html', 'text/plain'}
+
+
+def choose_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress_response(response):
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    config = current_app.config
+    if response.content_length is None or response.content_length < config['COMPRESS_MIN_SIZE']:
+        return response
+    encoding = choose_encoding()
+    if encoding is None:
+        return response
+
+    body = response.get_data()
+    if encoding == 'br':
+        response.set_data(brotli.compress(body, quality=config['COMPRESS_BROTLI_QUALITY']))
+    else:
+        response.set_data(gzip.compress(body, compresslevel=config['COMPRESS_LEVEL'], mtime=0))
+    response.headers['Content-Encoding'] = encoding
+
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
@@ -0,0 +1,66 @@
+"""Conditional GETs for the catalog listings (subjects, chapters, quizzes).
+
+A listing's version stamp is MAX(updated_at) and COUNT(*) of every table
+it reads, fetched in one SELECT: the MAX is an index lookup and catches
+inserts and edits, the count catches deletes. The stamp becomes a strong
+ETag and the MAX a Last-Modified header, so an unchanged catalog costs a
+single small query and an empty 304 response.
+"""
+import hashlib
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from flask import current_app, request
+from sqlalchemy import func, select
+
+from migrations import migration
+from models import db, Subject, Chapter, Quiz
+
+
+CatalogStamp = namedtuple('CatalogStamp', ['etag', 'last_modified'])
+
+
+def catalog_stamp(*models):
+    columns = []
+    for model in models:
+        columns.append(select(func.max(model.updated_at)).scalar_subquery())
+        columns.append(select(func.count()).select_from(model).scalar_subquery())
+    row = db.session.execute(select(*columns)).one()
+
+    token = repr(([model.__tablename__ for model in models], tuple(row)))
+    etag = hashlib.sha1(token.encode('utf-8')).hexdigest()
+    modified = [value for value in row[0::2] if value is not None]
+    last_modified = max(modified).replace(microsecond=0, tzinfo=timezone.utc) if modified else None
+    return CatalogStamp(etag, last_modified)
+
+
+def not_modified(stamp):
+    """A 304 response if the request's validators match ``stamp``, else None."""
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(stamp.etag)
+    else:
+        since = request.if_modified_since
+        fresh = since is not None and stamp.last_modified is not None and since >= stamp.last_modified
+    if not fresh:
+        return None
+    return with_validators(current_app.response_class(status=304), stamp)
+
+
+def with_validators(response, stamp):
+    response.set_etag(stamp.etag)
+    if stamp.last_modified is not None:
+        response.last_modified = stamp.last_modified
+    # Let browsers keep the listing but revalidate it on every use
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+@migration('backfill_catalog_updated_at')
+def backfill_catalog_updated_at(connection):
+    for model in (Subject, Chapter, Quiz):
+        connection.execute(
+            model.__table__.update()
+            .where(model.updated_at.is_(None))
+            .values(updated_at=func.coalesce(model.created_at, datetime.utcnow()))
+        )
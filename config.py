@@ -11,17 +11,97 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///db.sqlite3')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Engine profile (see database.py). Pool settings apply to every backend;
+    # pre-ping/recycle only to server databases, pragmas only to SQLite.
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ['true', '1']
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 268435456))
+
+    # Production server (gunicorn.conf.py). Each worker is a separate process
+    # with its own engine pool and password-hashing pool; threads serve
+    # requests concurrently within a worker.
+    SERVER_BIND = os.getenv('SERVER_BIND', '0.0.0.0:5001')
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', (os.cpu_count() or 1) * 2 + 1))
+    SERVER_THREADS = int(os.getenv('SERVER_THREADS', 4))
+    SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', 60))
+
+    # Account created by `flask setup-db` / `flask create-admin` if missing.
+    ADMIN_EMAIL = os.getenv('ADMIN_EMAIL', 'admin@quizmaster.com')
+    ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'adminpass')
+
+    # werkzeug method string ('scrypt', 'scrypt:N:r:p', 'pbkdf2[:hash[:iterations]]'),
+    # expanded at startup; hashes made with anything else are upgraded on the
+    # user's next successful login.
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    # Hashing runs in a per-worker process pool (0 = hash inline). At most
+    # PASSWORD_HASH_MAX_PENDING hashes may wait; others get a 503 after the timeout.
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 16))
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv('PASSWORD_HASH_QUEUE_TIMEOUT', 2))
+
     
     MAIL_SERVER = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
     MAIL_PORT = int(os.getenv('MAIL_PORT', 587))
     MAIL_USE_TLS = os.getenv('MAIL_USE_TLS', 'true').lower() in ['true', '1']
     MAIL_USERNAME = os.getenv('MAIL_USERNAME', 'your_email@gmail.com')
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD', 'your_email_password')
+    # Bulk delivery: messages per SMTP connection / Celery subtask, sends per
+    # second in total across all delivery tasks (shared through REDIS_URL;
+    # 0 = unlimited) and retry policy for failures.
+    MAIL_BATCH_SIZE = int(os.getenv('MAIL_BATCH_SIZE', 50))
+    MAIL_SEND_RATE = float(os.getenv('MAIL_SEND_RATE', 10))
+    MAIL_MAX_RETRIES = int(os.getenv('MAIL_MAX_RETRIES', 5))
+    MAIL_RETRY_BACKOFF = int(os.getenv('MAIL_RETRY_BACKOFF', 30))
 
    
     CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
     CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
 
+    # Application data kept in Redis (leaderboards, caches). Use 'fakeredis://'
+    # to run against an in-process stand-in (requires the fakeredis package).
+    REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/1')
+    SCORE_HISTORY_CACHE_TTL = int(os.getenv('SCORE_HISTORY_CACHE_TTL', 3600))
+    # Write-behind scores (see score_queue.py): submissions are queued in Redis
+    # and written in batches by the tasks.flush_pending_scores beat task.
+    SCORE_WRITE_BEHIND = os.getenv('SCORE_WRITE_BEHIND', 'false').lower() in ['true', '1']
+    SCORE_FLUSH_BATCH_SIZE = int(os.getenv('SCORE_FLUSH_BATCH_SIZE', 500))
+    SCORE_FLUSH_INTERVAL = float(os.getenv('SCORE_FLUSH_INTERVAL', 2))
+
+    # Request/SQL/task metrics kept in Redis and served at /api/admin/metrics to
+    # an admin session or, for Prometheus, 'Authorization: Bearer <METRICS_TOKEN>'.
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() in ['true', '1']
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+    # Log requests slower than this many ms with their SQL (0 = off).
+    SLOW_REQUEST_MS = int(os.getenv('SLOW_REQUEST_MS', 0))
+    SLOW_REQUEST_MAX_STATEMENTS = int(os.getenv('SLOW_REQUEST_MAX_STATEMENTS', 100))
+
+    # Percentage at or above which an attempt counts as passed in results analytics.
+    PASS_PERCENTAGE = float(os.getenv('PASS_PERCENTAGE', 40))
+
+    # 'orjson' (falls back to 'stdlib' when orjson isn't installed) or 'stdlib'.
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'orjson')
+    # API responses larger than this are gzip- or brotli-encoded (brotli needs
+    # the optional brotli package) when the client accepts it.
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))
+
+    # List endpoints return at most this many rows per page (?limit= can go up to the max).
+    API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', 50))
+    API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', 200))
+
+    # Rows fetched per round trip (and written per chunk) by the score export.
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+    QUESTION_IMPORT_MAX_ROWS = int(os.getenv('QUESTION_IMPORT_MAX_ROWS', 20000))
+    # Where background export jobs write their CSV files.
+    EXPORT_DIR = os.getenv('EXPORT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exports'))
+
 
     
     
@@ -0,0 +1,63 @@
+"""Database engine profile driven by ``Config``.
+
+SQLite gets WAL journaling (readers no longer block on the writer),
+``synchronous=NORMAL`` (safe with WAL, one fsync per checkpoint instead of
+per commit), a busy timeout so concurrent writers wait instead of failing
+with "database is locked", and memory-mapped reads. Server databases get a
+sized connection pool with pre-ping and recycling.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+
+def is_sqlite(uri):
+    return make_url(uri).get_backend_name() == 'sqlite'
+
+
+def is_sqlite_memory(uri):
+    """In-memory SQLite gets a single shared connection (StaticPool), not a QueuePool."""
+    url = make_url(uri)
+    return url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
+
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured database."""
+    uri = config['SQLALCHEMY_DATABASE_URI']
+    options = {}
+    if not (is_sqlite(uri) and is_sqlite_memory(uri)):
+        options.update({
+            'pool_size': config['DB_POOL_SIZE'],
+            'max_overflow': config['DB_MAX_OVERFLOW'],
+            'pool_timeout': config['DB_POOL_TIMEOUT'],
+        })
+    if is_sqlite(uri):
+        options['connect_args'] = {'timeout': config['SQLITE_BUSY_TIMEOUT_MS'] / 1000}
+    else:
+        options['pool_pre_ping'] = config['DB_POOL_PRE_PING']
+        options['pool_recycle'] = config['DB_POOL_RECYCLE']
+    return options
+
+
+def install_sqlite_pragmas(engine, config):
+    """Apply the configured pragmas to every new SQLite connection."""
+    pragmas = [
+        f"PRAGMA journal_mode={config['SQLITE_JOURNAL_MODE']}",
+        f"PRAGMA synchronous={config['SQLITE_SYNCHRONOUS']}",
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+    ]
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def configure_engine(app, db):
+    with app.app_context():
+        if db.engine.dialect.name == 'sqlite':
+            install_sqlite_pragmas(db.engine, app.config)
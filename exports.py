@@ -0,0 +1,166 @@
+import csv
+import io
+import os
+import secrets
+import zlib
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import func
+
+from models import db, User, Subject, Chapter, Quiz, Score, ExportJob
+
+
+EXPORT_FIELDNAMES = [
+    'Score ID', 'User Email', 'User Full Name', 'Quiz Name',
+    'Subject Name', 'Chapter Name', 'Score', 'Total Possible', 'Attempt Date'
+]
+
+
+def _export_columns_query():
+    return db.session.query(
+        Score.id,
+        Score.total_scored,
+        Score.total_possible,
+        Score.time_stamp_of_attempt,
+        User.email,
+        User.full_name,
+        Quiz.name.label('quiz_name'),
+        Chapter.name.label('chapter_name'),
+        Subject.name.label('subject_name'),
+    ).outerjoin(User, Score.user_id == User.id) \
+     .outerjoin(Quiz, Score.quiz_id == Quiz.id) \
+     .outerjoin(Chapter, Quiz.chapter_id == Chapter.id) \
+     .outerjoin(Subject, Chapter.subject_id == Subject.id)
+
+
+def _format_row(row):
+    return [
+        row.id,
+        row.email or 'N/A',
+        row.full_name or 'N/A',
+        row.quiz_name or 'N/A',
+        row.subject_name or 'N/A',
+        row.chapter_name or 'N/A',
+        row.total_scored,
+        row.total_possible,
+        row.time_stamp_of_attempt.strftime('%Y-%m-%d %H:%M:%S') if row.time_stamp_of_attempt else ''
+    ]
+
+
+def export_rows_query(batch_size):
+    """One joined, server-side streamed query over every score.
+
+    ``yield_per`` makes SQLAlchemy fetch ``batch_size`` rows at a time from
+    the cursor instead of buffering the whole result, so memory stays flat
+    regardless of how many scores exist.
+    """
+    return _export_columns_query().order_by(Score.id).yield_per(batch_size)
+
+
+def iter_export_rows(batch_size=1000):
+    for row in export_rows_query(batch_size):
+        yield _format_row(row)
+
+
+def iter_export_batches(batch_size=1000):
+    """Yield lists of export rows, one keyset-bounded query per batch.
+
+    Unlike ``iter_export_rows`` no cursor stays open between batches, so the
+    caller can commit (e.g. progress updates) while iterating.
+    """
+    last_id = 0
+    while True:
+        rows = _export_columns_query().filter(Score.id > last_id).order_by(Score.id).limit(batch_size).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        yield [_format_row(row) for row in rows]
+
+
+def iter_csv_chunks(rows, rows_per_chunk=1000):
+    """Encode ``rows`` as CSV, yielding one string per ``rows_per_chunk`` rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDNAMES)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
+
+
+def iter_gzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def run_export_job(job_id):
+    """Run the export described by ExportJob ``job_id`` to completion.
+
+    Progress is committed after every batch, and the job's
+    ``cancel_requested`` flag is re-read at the same point so an admin can
+    stop a long export between batches. The CSV is written to a ``.part``
+    file and only renamed into place once it is complete.
+    """
+    job = db.session.get(ExportJob, job_id)
+    if job is None or job.is_finished:
+        return None
+    if job.cancel_requested:
+        job.status = 'cancelled'
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+        return job
+
+    job.status = 'running'
+    job.started_at = datetime.utcnow()
+    job.total_rows = db.session.query(func.count(Score.id)).scalar()
+    db.session.commit()
+
+    export_dir = current_app.config['EXPORT_DIR']
+    os.makedirs(export_dir, exist_ok=True)
+    timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+    filename = f'scores_export_{job.id}_{timestamp}_{secrets.token_hex(4)}.csv'
+    path = os.path.join(export_dir, filename)
+    partial_path = path + '.part'
+
+    try:
+        with open(partial_path, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(EXPORT_FIELDNAMES)
+            for batch in iter_export_batches(current_app.config['EXPORT_BATCH_SIZE']):
+                writer.writerows(batch)
+                job.rows_processed += len(batch)
+                db.session.commit()
+                if job.cancel_requested:
+                    raise ExportCancelled()
+        os.replace(partial_path, path)
+        job.status = 'completed'
+        job.filename = filename
+    except ExportCancelled:
+        job.status = 'cancelled'
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Export job {job_id} failed: {e}")
+        job.status = 'failed'
+        job.error = str(e)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+    return job
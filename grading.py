@@ -0,0 +1,34 @@
+from cache import VersionedCache
+from models import db, Question
+
+
+# quiz_id -> frozenset of (question_id, correct_option), keyed by Quiz.cache_version
+answer_keys = VersionedCache()
+
+
+def load_answer_key(quiz_id):
+    rows = db.session.query(Question.id, Question.correct_option).filter_by(quiz_id=quiz_id)
+    return frozenset((question_id, correct_option) for question_id, correct_option in rows)
+
+
+def get_answer_key(quiz):
+    return answer_keys.get_or_build(quiz.id, quiz.cache_version, lambda: load_answer_key(quiz.id))
+
+
+def grade(answer_key, user_answers):
+    """Return the number of correct answers in ``user_answers``.
+
+    ``user_answers`` maps question ids (as sent by the client, usually
+    strings) to the selected option; answers to unknown questions and
+    malformed ids simply don't match anything in the key.
+    """
+    submitted = set()
+    for q_id_str, submitted_answer in user_answers.items():
+        try:
+            q_id = int(q_id_str)
+        except (TypeError, ValueError):
+            continue
+        if isinstance(submitted_answer, str):
+            submitted.add((q_id, submitted_answer))
+    return len(answer_key & submitted)
+
@@ -0,0 +1,25 @@
+"""gunicorn settings, sized from Config (SERVER_* environment variables).
+
+The app is imported once in the master (``preload_app``) and forked into
+``SERVER_WORKERS`` processes, each serving ``SERVER_THREADS`` requests at a
+time. Connections must not be shared across the fork, so every worker
+drops the pooled database connections and the Redis client it inherited.
+"""
+from config import Config
+
+
+wsgi_app = 'wsgi:app'
+bind = Config.SERVER_BIND
+workers = Config.SERVER_WORKERS
+threads = Config.SERVER_THREADS
+worker_class = 'gthread' if threads > 1 else 'sync'
+timeout = Config.SERVER_TIMEOUT
+preload_app = True
+accesslog = '-'
+
+
+def post_fork(server, worker):
+    from app import reset_connections
+    from wsgi import app
+
+    reset_connections(app)
@@ -0,0 +1,140 @@
+"""Leaderboards backed by Redis sorted sets.
+
+Each quiz has a sorted set of user id -> best percentage score. Chapter and
+subject boards roll these up: a user's chapter score is the sum of their
+best scores across the chapter's quizzes, so only improvements on a quiz
+move the rollups (by the size of the improvement).
+"""
+import uuid
+
+from sqlalchemy import func
+
+from models import db, User, Chapter, Quiz, Score
+from redis_store import get_redis
+from stats import score_percentage_expr
+
+
+SCOPES = ('quiz', 'chapter', 'subject')
+# Outside the leaderboard:* namespace, which a rebuild sweeps
+REBUILD_LOCK_KEY = 'leaderboards:rebuild-lock'
+REBUILD_LOCK_TIMEOUT = 300
+
+
+def leaderboard_key(scope, scope_id):
+    return f'leaderboard:{scope}:{scope_id}'
+
+
+def record_score(quiz_id, chapter_id, subject_id, user_id, percentage):
+    """Keep the user's best attempt on the quiz and roll any improvement up.
+
+    Uses WATCH/MULTI on the quiz board so concurrent submissions by the same
+    user can't both apply their delta to the rollups.
+    """
+    client = get_redis()
+    quiz_key = leaderboard_key('quiz', quiz_id)
+
+    def update(pipe):
+        previous = pipe.zscore(quiz_key, user_id)
+        if previous is not None and previous >= percentage:
+            return
+        delta = percentage - (previous or 0)
+        pipe.multi()
+        pipe.zadd(quiz_key, {user_id: percentage})
+        pipe.zincrby(leaderboard_key('chapter', chapter_id), delta, user_id)
+        pipe.zincrby(leaderboard_key('subject', subject_id), delta, user_id)
+
+    client.transaction(update, quiz_key)
+
+
+def top(scope, scope_id, limit):
+    entries = get_redis().zrevrange(leaderboard_key(scope, scope_id), 0, limit - 1, withscores=True)
+    user_ids = [int(member) for member, _ in entries]
+    names = dict(db.session.query(User.id, User.full_name).filter(User.id.in_(user_ids))) if user_ids else {}
+    return [{
+        'rank': position + 1,
+        'user_id': user_id,
+        'full_name': names.get(user_id, 'Unknown User'),
+        'score': score
+    } for position, (user_id, (_, score)) in enumerate(zip(user_ids, entries))]
+
+
+def rank_of(scope, scope_id, user_id):
+    client = get_redis()
+    key = leaderboard_key(scope, scope_id)
+    pipe = client.pipeline(transaction=False)
+    pipe.zrevrank(key, user_id)
+    pipe.zscore(key, user_id)
+    pipe.zcard(key)
+    rank, score, total = pipe.execute()
+    return {
+        'rank': rank + 1 if rank is not None else None,
+        'score': score,
+        'total': total
+    }
+
+
+def rebuild_leaderboards(batch_size=1000):
+    """Repopulate every board from the Score table.
+
+    Boards are built under temporary keys from one grouped query (best
+    percentage per user and quiz) and then renamed over the live keys, so
+    readers never see a half-built board. Boards with no remaining scores
+    are deleted. Only one rebuild runs at a time; temporary keys left by a
+    crashed run are cleared first, since chapter and subject boards are
+    accumulated with ZINCRBY. Returns the number of boards written, or None
+    if another rebuild holds the lock.
+    """
+    client = get_redis()
+    token = uuid.uuid4().hex
+    if not client.set(REBUILD_LOCK_KEY, token, nx=True, ex=REBUILD_LOCK_TIMEOUT):
+        return None
+    try:
+        return _rebuild(client, batch_size)
+    finally:
+        if client.get(REBUILD_LOCK_KEY) == token:
+            client.delete(REBUILD_LOCK_KEY)
+
+
+def _rebuild(client, batch_size):
+    stale = list(client.scan_iter(match='leaderboard:*:rebuild'))
+    if stale:
+        client.delete(*stale)
+
+    best = db.session.query(
+        Score.user_id,
+        Score.quiz_id,
+        Quiz.chapter_id,
+        Chapter.subject_id,
+        func.max(score_percentage_expr()),
+    ).join(Quiz, Score.quiz_id == Quiz.id) \
+     .join(Chapter, Quiz.chapter_id == Chapter.id) \
+     .group_by(Score.user_id, Score.quiz_id, Quiz.chapter_id, Chapter.subject_id) \
+     .yield_per(batch_size)
+
+    built = set()
+    pipe = client.pipeline(transaction=False)
+    pending = 0
+    for user_id, quiz_id, chapter_id, subject_id, percentage in best:
+        keys = (
+            leaderboard_key('quiz', quiz_id),
+            leaderboard_key('chapter', chapter_id),
+            leaderboard_key('subject', subject_id),
+        )
+        pipe.zadd(f'{keys[0]}:rebuild', {user_id: percentage})
+        pipe.zincrby(f'{keys[1]}:rebuild', percentage, user_id)
+        pipe.zincrby(f'{keys[2]}:rebuild', percentage, user_id)
+        built.update(keys)
+        pending += 1
+        if pending >= batch_size:
+            pipe.expire(REBUILD_LOCK_KEY, REBUILD_LOCK_TIMEOUT)
+            pipe.execute()
+            pending = 0
+    pipe.execute()
+
+    for key in built:
+        pipe.rename(f'{key}:rebuild', key)
+    for key in client.scan_iter(match='leaderboard:*'):
+        if key not in built and not key.endswith(':rebuild'):
+            pipe.delete(key)
+    pipe.execute()
+    return len(built)
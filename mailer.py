@@ -0,0 +1,116 @@
+import math
+import time
+
+from flask import current_app
+from flask_mail import Message
+from redis.exceptions import RedisError
+
+from redis_store import get_redis
+
+
+SEND_RATE_KEY = 'mail:send-rate'
+
+
+def build_message(subject, recipient, sender, body=None, html=None):
+    """A JSON-serializable description of one outgoing email (one recipient)."""
+    return {'subject': subject, 'recipient': recipient, 'sender': sender, 'body': body, 'html': html}
+
+
+def iter_batches(items, batch_size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class RateLimiter:
+    """Spaces calls to ``wait()`` so at most ``rate`` happen per second (0 disables)."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self._next = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if now < self._next:
+            time.sleep(self._next - now)
+            now = self._next
+        self._next = now + self.interval
+
+
+class SharedRateLimiter:
+    """``rate`` sends per second across every process sharing the Redis server.
+
+    Each window of ``max(1, 1/rate)`` seconds has an INCR counter; a sender
+    over the window's allowance sleeps until the next window. Windows follow
+    the local clock, so worker hosts should be NTP-synced. If Redis is down
+    the limit falls back to this process alone.
+    """
+
+    def __init__(self, rate, key=SEND_RATE_KEY):
+        self.rate = rate
+        self.key = key
+        self.window = max(1.0, 1.0 / rate) if rate else 0
+        self.allowance = round(rate * self.window) if rate else 0
+        self._local = None
+
+    def wait(self):
+        if not self.rate:
+            return
+        if self._local is not None:
+            return self._local.wait()
+        try:
+            self._wait_shared()
+        except RedisError as e:
+            current_app.logger.warning(f"Send rate limit unavailable, limiting this task only: {e}")
+            self._local = RateLimiter(self.rate)
+            self._local.wait()
+
+    def _wait_shared(self):
+        client = get_redis()
+        while True:
+            now = time.time()
+            window = math.floor(now / self.window)
+            key = f'{self.key}:{window}'
+            pipe = client.pipeline()
+            pipe.incr(key)
+            pipe.expire(key, math.ceil(self.window) + 1)
+            count, _ = pipe.execute()
+            if count <= self.allowance:
+                return
+            time.sleep((window + 1) * self.window - now)
+
+
+def send_batch(mail, messages, rate=0):
+    """Send ``messages`` over a single SMTP connection.
+
+    Returns the messages that could not be delivered so the caller can retry
+    just those recipients. If the connection itself cannot be opened, every
+    message in the batch is returned.
+    """
+    limiter = SharedRateLimiter(rate)
+    failed = []
+    attempted = 0
+    try:
+        with mail.connect() as connection:
+            for message in messages:
+                limiter.wait()
+                attempted += 1
+                msg = Message(message['subject'], sender=message['sender'], recipients=[message['recipient']])
+                msg.body = message['body']
+                msg.html = message['html']
+                try:
+                    connection.send(msg)
+                except Exception as e:
+                    current_app.logger.warning(f"Failed to send '{message['subject']}' to {message['recipient']}: {e}")
+                    failed.append(message)
+    except Exception as e:
+        current_app.logger.error(f"SMTP connection failed: {e}")
+        failed.extend(messages[attempted:])
+    return failed
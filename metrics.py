@@ -0,0 +1,186 @@
+"""Request, SQL and Celery task metrics, exposed in Prometheus text format.
+
+Every request records its latency and the number and total time of
+the SQL statements it issued (counted with engine events). Celery workers
+record task durations from task_prerun/task_postrun. Counters live in
+Redis hashes so that all web and worker processes add to the same series
+and any process can render them for ``/admin/metrics``. Requests slower
+than ``SLOW_REQUEST_MS`` are logged with the SQL they ran.
+"""
+import bisect
+import time
+
+from flask import current_app, g, has_request_context, request
+from redis.exceptions import RedisError
+from sqlalchemy import event
+
+from redis_store import get_redis
+
+
+HTTP_KEY = 'metrics:http'
+SQL_KEY = 'metrics:sql'
+TASK_KEY = 'metrics:tasks'
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250)
+TASK_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 300, 1800)
+
+
+def _observe(pipe, key, series, buckets, value):
+    """Adds ``value`` to a histogram stored as per-bucket (non-cumulative) counts."""
+    index = bisect.bisect_left(buckets, value)
+    if index < len(buckets):
+        pipe.hincrby(key, f'{series}|b{index}', 1)
+    pipe.hincrby(key, f'{series}|count', 1)
+    pipe.hincrbyfloat(key, f'{series}|sum', value)
+
+
+# --- Collection ---
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'sql_queries' in g:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_metrics_started', None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    g.sql_queries += 1
+    g.sql_seconds += elapsed
+    if g.sql_statements is not None and len(g.sql_statements) < current_app.config['SLOW_REQUEST_MAX_STATEMENTS']:
+        g.sql_statements.append((elapsed, statement))
+
+
+def _start_request():
+    g.request_started = time.perf_counter()
+    g.sql_queries = 0
+    g.sql_seconds = 0.0
+    g.sql_statements = [] if current_app.config['SLOW_REQUEST_MS'] else None
+
+
+def _finish_request(response):
+    started = g.pop('request_started', None)
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    endpoint = request.endpoint or 'unmatched'
+    series = f'{request.method}|{endpoint}'
+
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        _observe(pipe, HTTP_KEY, series, HTTP_BUCKETS, elapsed)
+        pipe.hincrby(HTTP_KEY, f'{series}|status={response.status_code}', 1)
+        _observe(pipe, SQL_KEY, series, QUERY_COUNT_BUCKETS, g.sql_queries)
+        pipe.hincrbyfloat(SQL_KEY, f'{series}|seconds', g.sql_seconds)
+        pipe.execute()
+    except RedisError as e:
+        current_app.logger.warning(f"Could not record request metrics: {e}")
+
+    threshold = current_app.config['SLOW_REQUEST_MS']
+    if threshold and elapsed * 1000 >= threshold:
+        statements = '\n'.join(f"  {seconds * 1000:.1f} ms  {statement}" for seconds, statement in g.sql_statements)
+        current_app.logger.warning(
+            f"Slow request: {request.method} {request.full_path.rstrip('?')} -> {endpoint} took {elapsed * 1000:.0f} ms, "
+            f"{g.sql_queries} queries ({g.sql_seconds * 1000:.0f} ms):\n{statements}"
+        )
+    return response
+
+
+def init_metrics(app, db):
+    if not app.config['METRICS_ENABLED']:
+        return
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(db.engine, 'after_cursor_execute', _after_cursor_execute)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+
+
+def record_task(task_name, state, seconds):
+    if not current_app.config['METRICS_ENABLED']:
+        return
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        _observe(pipe, TASK_KEY, f'{task_name}|{state}', TASK_BUCKETS, seconds)
+        pipe.execute()
+    except RedisError as e:
+        current_app.logger.warning(f"Could not record task metrics: {e}")
+
+
+# --- Exposition ---
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _histograms(fields, label_names):
+    """Groups a hash written by ``_observe`` into {label tuple: (bucket counts, count, sum)}."""
+    series = {}
+    for field, value in fields.items():
+        *labels, kind = field.split('|')
+        if len(labels) != len(label_names):
+            continue
+        entry = series.setdefault(tuple(labels), {'buckets': {}, 'count': 0, 'sum': 0.0, 'extra': {}})
+        if kind == 'count':
+            entry['count'] = int(value)
+        elif kind == 'sum':
+            entry['sum'] = float(value)
+        elif kind.startswith('b'):
+            entry['buckets'][int(kind[1:])] = int(value)
+        else:
+            entry['extra'][kind] = value
+    return series
+
+
+def _render_histogram(lines, name, help_text, buckets, series, label_names):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} histogram')
+    for labels, entry in sorted(series.items()):
+        label_map = dict(zip(label_names, labels))
+        cumulative = 0
+        for index, bound in enumerate(buckets):
+            cumulative += entry['buckets'].get(index, 0)
+            lines.append(f'{name}_bucket{_labels(**label_map, le=bound)} {cumulative}')
+        lines.append(f'{name}_bucket{_labels(**label_map, le="+Inf")} {entry["count"]}')
+        lines.append(f'{name}_sum{_labels(**label_map)} {entry["sum"]}')
+        lines.append(f'{name}_count{_labels(**label_map)} {entry["count"]}')
+
+
+def render_prometheus():
+    redis_client = get_redis()
+    pipe = redis_client.pipeline(transaction=False)
+    for key in (HTTP_KEY, SQL_KEY, TASK_KEY):
+        pipe.hgetall(key)
+    http_fields, sql_fields, task_fields = pipe.execute()
+    lines = []
+
+    http = _histograms(http_fields, ('method', 'endpoint'))
+    _render_histogram(lines, 'quizmaster_http_request_duration_seconds',
+                      'API request latency by endpoint.', HTTP_BUCKETS, http, ('method', 'endpoint'))
+    lines.append('# HELP quizmaster_http_responses_total API responses by endpoint and status code.')
+    lines.append('# TYPE quizmaster_http_responses_total counter')
+    for (method, endpoint), entry in sorted(http.items()):
+        for kind, value in sorted(entry['extra'].items()):
+            if kind.startswith('status='):
+                labels = _labels(method=method, endpoint=endpoint, status=kind[len('status='):])
+                lines.append(f'quizmaster_http_responses_total{labels} {value}')
+
+    sql = _histograms(sql_fields, ('method', 'endpoint'))
+    _render_histogram(lines, 'quizmaster_sql_queries_per_request',
+                      'SQL statements issued per API request.', QUERY_COUNT_BUCKETS, sql, ('method', 'endpoint'))
+    lines.append('# HELP quizmaster_sql_duration_seconds_total Time spent executing SQL, by endpoint.')
+    lines.append('# TYPE quizmaster_sql_duration_seconds_total counter')
+    for (method, endpoint), entry in sorted(sql.items()):
+        seconds = entry['extra'].get('seconds', 0)
+        lines.append(f'quizmaster_sql_duration_seconds_total{_labels(method=method, endpoint=endpoint)} {seconds}')
+
+    tasks = _histograms(task_fields, ('task', 'state'))
+    _render_histogram(lines, 'quizmaster_celery_task_duration_seconds',
+                      'Celery task run time by task and final state.', TASK_BUCKETS, tasks, ('task', 'state'))
+    return '\n'.join(lines) + '\n'
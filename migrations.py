@@ -0,0 +1,84 @@
+"""In-place schema upgrades for existing databases.
+
+``db.create_all()`` only creates tables that don't exist yet, so columns and
+indexes added to existing models never reach a database created by an
+older version of the app. ``upgrade()`` reconciles the live schema with
+the models (new tables, new columns, new indexes) and then runs any named
+data migrations that haven't been applied, recording them in a
+``schema_migrations`` table. Every step is idempotent, so it is safe to run
+on every deploy.
+"""
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+
+from models import db
+
+
+MIGRATIONS = []
+
+
+def migration(name):
+    """Register ``fn(connection)`` to run once, in registration order."""
+    def decorator(fn):
+        MIGRATIONS.append((name, fn))
+        return fn
+    return decorator
+
+
+def _add_column(connection, table, column):
+    if not column.nullable and column.server_default is None:
+        raise RuntimeError(
+            f"Cannot add NOT NULL column {table.name}.{column.name} without a server_default"
+        )
+    column_spec = CreateColumn(column).compile(dialect=connection.dialect)
+    table_name = connection.dialect.identifier_preparer.format_table(table)
+    ddl = f"ALTER TABLE {table_name} ADD COLUMN {column_spec}"
+    connection.execute(text(ddl))
+
+
+def sync_schema(connection):
+    """Create missing tables, columns and indexes declared on the models."""
+    existing_tables = set(inspect(connection).get_table_names())
+    db.metadata.create_all(connection)
+    applied = [f"table {t.name}" for t in db.metadata.sorted_tables if t.name not in existing_tables]
+
+    inspector = inspect(connection)
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_columns = {c['name'] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing_columns:
+                _add_column(connection, table, column)
+                applied.append(f"column {table.name}.{column.name}")
+
+        existing_indexes = {i['name'] for i in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(connection)
+                applied.append(f"index {index.name}")
+    return applied
+
+
+def upgrade():
+    """Bring the current app's database up to date; returns a list of applied changes."""
+    with db.engine.begin() as connection:
+        applied = sync_schema(connection)
+
+        connection.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations "
+            "(name VARCHAR(255) PRIMARY KEY, applied_at TIMESTAMP NOT NULL)"
+        ))
+        done = {row[0] for row in connection.execute(text("SELECT name FROM schema_migrations"))}
+        for name, fn in MIGRATIONS:
+            if name in done:
+                continue
+            fn(connection)
+            connection.execute(
+                text("INSERT INTO schema_migrations (name, applied_at) VALUES (:name, :applied_at)"),
+                {'name': name, 'applied_at': datetime.utcnow()}
+            )
+            applied.append(f"migration {name}")
+    return applied
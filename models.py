@@ -21,7 +21,7 @@ class User(db.Model):
             'email': self.email,
             'full_name': self.full_name,
             'qualification': self.qualification,
-            'dob': self.dob.strftime('%Y-%m-%d') if self.dob else None,
+            'dob': self.dob,
             'role': self.role
         }
 
@@ -34,6 +34,8 @@ class Subject(db.Model):
     name = db.Column(db.String(100), unique=True, nullable=False)
     description = db.Column(db.String(255))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Maintained on every ORM/Core update; MAX() of it drives catalog ETags (conditional.py).
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     chapters = db.relationship('Chapter', backref='subject', lazy=True, cascade="all, delete-orphan") 
 
@@ -42,7 +44,7 @@ class Subject(db.Model):
             'id': self.id,
             'name': self.name,
             'description': self.description,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at
         }
 
     def __repr__(self):
@@ -53,8 +55,9 @@ class Chapter(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.String(255))
-    subject_id = db.Column(db.Integer, db.ForeignKey('subject.id'), nullable=False)
+    subject_id = db.Column(db.Integer, db.ForeignKey('subject.id'), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     quizzes = db.relationship('Quiz', backref='chapter', lazy=True, cascade="all, delete-orphan") 
 
     def serialize(self):
@@ -63,7 +66,7 @@ class Chapter(db.Model):
             'name': self.name,
             'description': self.description,
             'subject_id': self.subject_id,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at
         }
 
     def __repr__(self):
@@ -73,11 +76,14 @@ class Chapter(db.Model):
 class Quiz(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False) 
-    chapter_id = db.Column(db.Integer, db.ForeignKey('chapter.id'), nullable=False)
+    chapter_id = db.Column(db.Integer, db.ForeignKey('chapter.id'), nullable=False, index=True)
     date_of_quiz = db.Column(db.DateTime, default=datetime.utcnow)
     time_duration = db.Column(db.String(10)) 
     remarks = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    # Bumped whenever the quiz or its questions change; validates cached answer keys and attempt payloads.
+    content_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     questions = db.relationship('Question', backref='quiz', lazy=True, cascade="all, delete-orphan") 
     scores = db.relationship('Score', backref='quiz', lazy=True, cascade="all, delete-orphan") 
@@ -87,14 +93,26 @@ class Quiz(db.Model):
             'id': self.id,
             'name': self.name, 
             'chapter_id': self.chapter_id,
-            'date_of_quiz': self.date_of_quiz.isoformat(),
+            'date_of_quiz': self.date_of_quiz,
             'time_duration': self.time_duration,
             'remarks': self.remarks,
-            'created_at': self.created_at.isoformat(),
+            'created_at': self.created_at,
             'chapter_name': self.chapter.name if self.chapter else None, # Include chapter name
             'subject_name': self.chapter.subject.name if self.chapter and self.chapter.subject else None # Include subject name
         }
 
+    @property
+    def cache_version(self):
+        # SQLite reuses a deleted quiz's id and content_version restarts at 0,
+        # so the creation time is what tells a new quiz from a deleted one.
+        return (self.created_at, self.content_version)
+
+    @staticmethod
+    def bump_content_version(quiz_id):
+        Quiz.query.filter_by(id=quiz_id).update(
+            {Quiz.content_version: Quiz.content_version + 1}, synchronize_session=False
+        )
+
     def __repr__(self):
         return f'<Quiz {self.name} (Chapter: {self.chapter_id})>'
 
@@ -102,7 +120,7 @@ class Quiz(db.Model):
 
 class Question(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    quiz_id = db.Column(db.Integer, db.ForeignKey('quiz.id'), nullable=False)
+    quiz_id = db.Column(db.Integer, db.ForeignKey('quiz.id'), nullable=False, index=True)
     question_statement = db.Column(db.Text, nullable=False)
     option1 = db.Column(db.String(255), nullable=False)
     option2 = db.Column(db.String(255), nullable=False)
@@ -125,7 +143,16 @@ class Question(db.Model):
 
 
 class Score(db.Model):
+    __table_args__ = (
+        db.Index('ix_score_user_time', 'user_id', 'time_stamp_of_attempt'), # score history, reminders
+        db.Index('ix_score_quiz_scored', 'quiz_id', 'total_scored'), # quiz results, leaderboards
+        db.Index('ix_score_time', 'time_stamp_of_attempt'), # monthly report window
+    )
+
     id = db.Column(db.Integer, primary_key=True)
+    # Client-visible id assigned when the attempt is graded; unique so a
+    # write-behind flush can be retried without duplicating attempts.
+    attempt_id = db.Column(db.String(32), unique=True, index=True)
     quiz_id = db.Column(db.Integer, db.ForeignKey('quiz.id'), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     time_stamp_of_attempt = db.Column(db.DateTime, default=datetime.utcnow)
@@ -137,7 +164,7 @@ class Score(db.Model):
             'id': self.id,
             'quiz_id': self.quiz_id,
             'user_id': self.user_id,
-            'time_stamp_of_attempt': self.time_stamp_of_attempt.isoformat(),
+            'time_stamp_of_attempt': self.time_stamp_of_attempt,
             'total_scored': self.total_scored,
             'total_possible': self.total_possible,
             'quiz_name': self.quiz.name if self.quiz else None, 
@@ -145,4 +172,90 @@ class Score(db.Model):
         }
 
     def __repr__(self):
-        return f'<Score {self.id} (User: {self.user_id}, Quiz: {self.quiz_id})>'
\ No newline at end of file
+        return f'<Score {self.id} (User: {self.user_id}, Quiz: {self.quiz_id})>'
+
+class QuizStats(db.Model):
+    """Running aggregates of every attempt at a quiz, maintained by submit_quiz.
+
+    Scores are tracked as percentages so attempts stay comparable when
+    questions are added or removed. ``bucket_<n>`` counts attempts scoring in
+    [10n, 10n + 10)%, with 100% counted in the last bucket.
+    """
+    quiz_id = db.Column(db.Integer, db.ForeignKey('quiz.id'), primary_key=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    score_sum = db.Column(db.Float, nullable=False, default=0)
+    score_sq_sum = db.Column(db.Float, nullable=False, default=0)
+    min_score = db.Column(db.Float)
+    max_score = db.Column(db.Float)
+    bucket_0 = db.Column(db.Integer, nullable=False, default=0)
+    bucket_1 = db.Column(db.Integer, nullable=False, default=0)
+    bucket_2 = db.Column(db.Integer, nullable=False, default=0)
+    bucket_3 = db.Column(db.Integer, nullable=False, default=0)
+    bucket_4 = db.Column(db.Integer, nullable=False, default=0)
+    bucket_5 = db.Column(db.Integer, nullable=False, default=0)
+    bucket_6 = db.Column(db.Integer, nullable=False, default=0)
+    bucket_7 = db.Column(db.Integer, nullable=False, default=0)
+    bucket_8 = db.Column(db.Integer, nullable=False, default=0)
+    bucket_9 = db.Column(db.Integer, nullable=False, default=0)
+
+    HISTOGRAM_BUCKETS = 10
+
+    def serialize(self):
+        attempts = self.attempts or 0
+        mean = self.score_sum / attempts if attempts else None
+        variance = max(self.score_sq_sum / attempts - mean * mean, 0) if attempts else None
+        return {
+            'quiz_id': self.quiz_id,
+            'attempts': attempts,
+            'mean_percentage': mean,
+            'stddev_percentage': variance ** 0.5 if variance is not None else None,
+            'min_percentage': self.min_score,
+            'max_percentage': self.max_score,
+            'histogram': [{
+                'from': i * 10,
+                'to': i * 10 + 10,
+                'count': getattr(self, f'bucket_{i}') or 0
+            } for i in range(self.HISTOGRAM_BUCKETS)]
+        }
+
+    def __repr__(self):
+        return f'<QuizStats {self.quiz_id} ({self.attempts} attempts)>'
+
+
+class ExportJob(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    task_id = db.Column(db.String(155))
+    status = db.Column(db.String(20), nullable=False, default='pending') # pending, running, completed, failed, cancelled
+    filename = db.Column(db.String(255))
+    rows_processed = db.Column(db.Integer, nullable=False, default=0)
+    total_rows = db.Column(db.Integer)
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    FINISHED_STATUSES = ('completed', 'failed', 'cancelled')
+
+    @property
+    def is_finished(self):
+        return self.status in self.FINISHED_STATUSES
+
+    def serialize(self):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'status': self.status,
+            'filename': self.filename,
+            'rows_processed': self.rows_processed,
+            'total_rows': self.total_rows,
+            'cancel_requested': self.cancel_requested,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+    def __repr__(self):
+        return f'<ExportJob {self.id} ({self.status})>'
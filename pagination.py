@@ -0,0 +1,94 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+Each endpoint declares a stable ordering as ``[(column, descending), ...]``
+ending in a unique column. A page is fetched with ``ORDER BY ... LIMIT
+size + 1`` and the next page starts strictly after the last row's key, so
+the cost of a page doesn't depend on how deep into the list it is. Cursors
+are opaque base64-encoded JSON lists of the last row's key values.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from flask import current_app, request
+from sqlalchemy import DateTime, Integer, String, and_, or_
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(token, order):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise InvalidCursor('Malformed cursor')
+    if not isinstance(values, list) or len(values) != len(order):
+        raise InvalidCursor('Malformed cursor')
+    return [_decode_value(column, value) for (column, _), value in zip(order, values)]
+
+
+def _decode_value(column, value):
+    """Check a cursor value against its column type; anything unexpected is an InvalidCursor."""
+    if isinstance(column.type, DateTime):
+        if not isinstance(value, str):
+            raise InvalidCursor('Malformed cursor')
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise InvalidCursor('Malformed cursor')
+    if isinstance(column.type, Integer):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise InvalidCursor('Malformed cursor')
+        return value
+    if isinstance(column.type, String):
+        if not isinstance(value, str):
+            raise InvalidCursor('Malformed cursor')
+        return value
+    raise InvalidCursor('Malformed cursor')
+
+
+def page_args():
+    """Read ``limit`` and ``cursor`` from the query string, capping the page size."""
+    default_size = current_app.config['API_PAGE_SIZE']
+    max_size = current_app.config['API_MAX_PAGE_SIZE']
+    limit = request.args.get('limit', default_size, type=int)
+    return max(1, min(limit, max_size)), request.args.get('cursor')
+
+
+def _after(order, values):
+    clauses = []
+    for i, (column, descending) in enumerate(order):
+        equal_prefix = [order[j][0] == values[j] for j in range(i)]
+        clauses.append(and_(*equal_prefix, column < values[i] if descending else column > values[i]))
+    return or_(*clauses)
+
+
+def paginate(query, order, page_size, cursor=None):
+    """Return ``(rows, next_cursor)`` for one page of ``query``.
+
+    ``next_cursor`` is None on the last page. Rows may be ORM objects or
+    labeled row tuples; the key values are read by each column's key.
+    """
+    if cursor:
+        query = query.filter(_after(order, decode_cursor(cursor, order)))
+    query = query.order_by(*[column.desc() if descending else column.asc() for column, descending in order])
+    rows = query.limit(page_size + 1).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column, _ in order])
+    return rows, next_cursor
+
+
+def with_next_cursor(response, next_cursor):
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
@@ -0,0 +1,108 @@
+"""Password hashing off the request thread.
+
+scrypt is deliberately CPU- and memory-hard, so hashing inline holds the
+GIL for the whole computation and stalls every other request handled by
+the worker. Hashes are instead computed in a small process pool; the
+request thread just waits on the result. A semaphore bounds how many
+hashes may be queued per worker process and rejects the rest quickly
+(``HashingBusy``) instead of letting a login storm pile up.
+"""
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import current_app
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash, check_password_hash
+
+
+class HashingBusy(Exception):
+    pass
+
+
+def normalize_method(method):
+    """Expand a werkzeug method string to the form it writes into hashes.
+
+    ``scrypt`` becomes ``scrypt:32768:8:1`` and ``pbkdf2`` becomes
+    ``pbkdf2:sha256:<default iterations>``, so ``needs_rehash`` can compare
+    prefixes directly. Raises ValueError for anything werkzeug can't use.
+    """
+    name, *args = method.split(':')
+    try:
+        if name == 'scrypt':
+            n, r, p = map(int, args) if args else (2 ** 15, 8, 1)
+            if min(n, r, p) < 1:
+                raise ValueError
+            return f'scrypt:{n}:{r}:{p}'
+        if name == 'pbkdf2' and len(args) <= 2:
+            hash_name = args[0] if args else 'sha256'
+            iterations = int(args[1]) if len(args) == 2 else DEFAULT_PBKDF2_ITERATIONS
+            if hash_name not in hashlib.algorithms_available or iterations < 1:
+                raise ValueError
+            return f'pbkdf2:{hash_name}:{iterations}'
+    except ValueError:
+        pass
+    raise ValueError(f"Unsupported PASSWORD_HASH_METHOD {method!r}")
+
+
+def init_passwords(app):
+    app.config['PASSWORD_HASH_METHOD'] = normalize_method(app.config['PASSWORD_HASH_METHOD'])
+
+
+_lock = threading.Lock()
+_executor = None
+_slots = None
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def _pool():
+    global _executor, _slots
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                config = current_app.config
+                _slots = threading.BoundedSemaphore(config['PASSWORD_HASH_MAX_PENDING'])
+                # Never fork: the pool is created inside multi-threaded server
+                # workers, and a forked child can inherit a lock held by another thread.
+                _executor = ProcessPoolExecutor(
+                    max_workers=config['PASSWORD_HASH_WORKERS'], mp_context=_mp_context()
+                )
+    return _executor, _slots
+
+
+def _run(fn, *args):
+    if not current_app.config['PASSWORD_HASH_WORKERS']:
+        return fn(*args)
+    executor, slots = _pool()
+    if not slots.acquire(timeout=current_app.config['PASSWORD_HASH_QUEUE_TIMEOUT']):
+        raise HashingBusy()
+    try:
+        return executor.submit(fn, *args).result()
+    finally:
+        slots.release()
+
+
+def hash_password(password):
+    return _run(generate_password_hash, password, current_app.config['PASSWORD_HASH_METHOD'])
+
+
+def verify_password(pwhash, password):
+    return _run(check_password_hash, pwhash, password)
+
+
+def needs_rehash(pwhash):
+    """True if ``pwhash`` was made with different method or cost parameters than configured."""
+    return pwhash.split('$', 1)[0] != current_app.config['PASSWORD_HASH_METHOD']
+
+
+def shutdown():
+    global _executor, _slots
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        _slots = None
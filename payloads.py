@@ -0,0 +1,45 @@
+import hashlib
+
+from flask import current_app
+
+from cache import VersionedCache
+from models import db, Question
+
+
+# quiz_id -> (json bytes, etag), keyed by Quiz.cache_version
+attempt_payloads = VersionedCache()
+
+
+def render_attempt_payload(quiz):
+    """Encode the student-facing attempt payload for ``quiz`` once.
+
+    The payload never includes ``correct_option`` and is identical for every
+    student, so it is stored as ready-to-send bytes together with a content
+    hash used as the ETag.
+    """
+    rows = db.session.query(
+        Question.id,
+        Question.quiz_id,
+        Question.question_statement,
+        Question.option1,
+        Question.option2,
+        Question.option3,
+        Question.option4,
+    ).filter_by(quiz_id=quiz.id).order_by(Question.id)
+
+    body = current_app.json.dumps({
+        'quiz_id': quiz.id,
+        'quiz_name': quiz.name,
+        'time_duration': quiz.time_duration,
+        'questions': [{
+            'id': row.id,
+            'quiz_id': row.quiz_id,
+            'question_statement': row.question_statement,
+            'options': [row.option1, row.option2, row.option3, row.option4]
+        } for row in rows]
+    }).encode('utf-8')
+    return body, hashlib.sha1(body).hexdigest()
+
+
+def get_attempt_payload(quiz):
+    return attempt_payloads.get_or_build(quiz.id, quiz.cache_version, lambda: render_attempt_payload(quiz))
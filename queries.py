@@ -0,0 +1,86 @@
+from models import db, User, Subject, Chapter, Quiz, Score
+
+
+def quiz_catalog_query():
+    """Quizzes joined to their chapter and subject in a single SELECT.
+
+    Only the columns the student dashboard renders are selected, so rows come
+    back as plain tuples instead of ORM objects with lazy relationships.
+    """
+    return db.session.query(
+        Quiz.id,
+        Quiz.name,
+        Quiz.time_duration,
+        Quiz.remarks,
+        Quiz.date_of_quiz,
+        Chapter.name.label('chapter_name'),
+        Subject.name.label('subject_name'),
+    ).outerjoin(Chapter, Quiz.chapter_id == Chapter.id) \
+     .outerjoin(Subject, Chapter.subject_id == Subject.id) \
+     .order_by(Quiz.id)
+
+
+def quiz_detail_query():
+    """Every Quiz column plus its chapter and subject names, as row tuples."""
+    return db.session.query(
+        Quiz.id,
+        Quiz.name,
+        Quiz.chapter_id,
+        Quiz.date_of_quiz,
+        Quiz.time_duration,
+        Quiz.remarks,
+        Quiz.created_at,
+        Chapter.name.label('chapter_name'),
+        Subject.name.label('subject_name'),
+    ).outerjoin(Chapter, Quiz.chapter_id == Chapter.id) \
+     .outerjoin(Subject, Chapter.subject_id == Subject.id)
+
+
+def user_listing_query():
+    return db.session.query(
+        User.id,
+        User.email,
+        User.full_name,
+        User.qualification,
+        User.dob,
+        User.role,
+    )
+
+
+def subject_listing_query():
+    return db.session.query(
+        Subject.id,
+        Subject.name,
+        Subject.description,
+        Subject.created_at,
+    )
+
+
+def score_history_query(user_id):
+    """A user's attempts with quiz, chapter and subject names, as row tuples."""
+    return db.session.query(
+        Score.id,
+        Score.attempt_id,
+        Score.time_stamp_of_attempt,
+        Score.total_scored,
+        Score.total_possible,
+        Quiz.name.label('quiz_name'),
+        Chapter.name.label('chapter_name'),
+        Subject.name.label('subject_name'),
+    ).outerjoin(Quiz, Score.quiz_id == Quiz.id) \
+     .outerjoin(Chapter, Quiz.chapter_id == Chapter.id) \
+     .outerjoin(Subject, Chapter.subject_id == Subject.id) \
+     .filter(Score.user_id == user_id)
+
+
+def quiz_results_query(quiz_id):
+    """Attempts at a quiz with the attempting user's name and email, as row tuples."""
+    return db.session.query(
+        Score.id,
+        Score.total_scored,
+        Score.total_possible,
+        Score.time_stamp_of_attempt,
+        User.full_name,
+        User.email,
+    ).outerjoin(User, Score.user_id == User.id) \
+     .filter(Score.quiz_id == quiz_id)
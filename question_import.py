@@ -0,0 +1,91 @@
+"""Validation and bulk insertion of quiz questions.
+
+``question_values`` holds the rules ``add_question`` has always applied, so
+single and bulk creation accept exactly the same input. A bulk import is
+validated in full before anything is written, then inserted with a single
+executemany in one transaction.
+"""
+import csv
+import io
+
+from sqlalchemy import insert
+
+from models import db, Quiz, Question
+
+
+CSV_FIELDS = ['question_statement', 'option1', 'option2', 'option3', 'option4', 'correct_option']
+OPTION_MAX_LENGTH = Question.option1.type.length
+
+
+class InvalidQuestion(ValueError):
+    pass
+
+
+def question_values(data):
+    """Column values for a question payload, or raises InvalidQuestion."""
+    if not isinstance(data, dict):
+        raise InvalidQuestion('Missing data for question')
+    question_statement = data.get('question_statement')
+    options = data.get('options', [])
+    correct_option = data.get('correct_option')
+
+    if not isinstance(options, list) or not all([question_statement, len(options) == 4, correct_option]):
+        raise InvalidQuestion('Missing data for question')
+
+    if not isinstance(question_statement, str) or not question_statement.strip():
+        raise InvalidQuestion('Question statement must be non-empty text')
+    if not all(isinstance(option, str) and option.strip() for option in options):
+        raise InvalidQuestion('Every option must be non-empty text')
+    if not isinstance(correct_option, str):
+        raise InvalidQuestion('Correct option must be text')
+    if any(len(option) > OPTION_MAX_LENGTH for option in options):
+        raise InvalidQuestion(f'Options must be at most {OPTION_MAX_LENGTH} characters')
+
+    if correct_option not in options:
+        raise InvalidQuestion('Correct option must be one of the provided options')
+
+    return {
+        'question_statement': question_statement,
+        'option1': options[0],
+        'option2': options[1],
+        'option3': options[2],
+        'option4': options[3],
+        'correct_option': correct_option,
+    }
+
+
+def parse_csv(stream):
+    """Reads question payloads from a CSV file with a ``CSV_FIELDS`` header."""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    missing = [field for field in CSV_FIELDS if field not in (reader.fieldnames or [])]
+    if missing:
+        raise InvalidQuestion(f"CSV is missing columns: {', '.join(missing)}")
+    for record in reader:
+        yield {
+            'question_statement': (record['question_statement'] or '').strip(),
+            'options': [(record[f'option{i}'] or '').strip() for i in range(1, 5)],
+            'correct_option': (record['correct_option'] or '').strip(),
+        }
+
+
+def validate_questions(quiz_id, items):
+    """Returns (rows, errors); errors carry the zero-based index of the bad row."""
+    rows, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            values = question_values(item)
+        except InvalidQuestion as e:
+            errors.append({'row': index, 'message': str(e)})
+            continue
+        values['quiz_id'] = quiz_id
+        rows.append(values)
+    return rows, errors
+
+
+def insert_questions(quiz_id, rows):
+    """Bulk-inserts validated rows and bumps the quiz content version. Caller commits."""
+    if rows:
+        db.session.execute(insert(Question), rows)
+        Quiz.bump_content_version(quiz_id)
+    return len(rows)
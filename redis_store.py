@@ -0,0 +1,16 @@
+import redis
+from flask import current_app
+
+
+def get_redis():
+    """The app's shared Redis client, created on first use from ``REDIS_URL``."""
+    client = current_app.extensions.get('redis')
+    if client is None:
+        url = current_app.config['REDIS_URL']
+        if url.startswith('fakeredis://'):
+            import fakeredis
+            client = fakeredis.FakeRedis(decode_responses=True)
+        else:
+            client = redis.Redis.from_url(url, decode_responses=True)
+        current_app.extensions['redis'] = client
+    return client
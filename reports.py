@@ -0,0 +1,116 @@
+from itertools import groupby
+
+from sqlalchemy import func
+
+from models import db, User, Quiz, Score
+
+
+def monthly_summaries(start, end):
+    """Per-user attempt count and score totals for [start, end), in one grouped query."""
+    rows = db.session.query(
+        Score.user_id,
+        func.count(Score.id),
+        func.coalesce(func.sum(Score.total_scored), 0),
+        func.coalesce(func.sum(Score.total_possible), 0),
+    ).join(User, Score.user_id == User.id) \
+     .filter(
+        User.role == 'user',
+        Score.time_stamp_of_attempt >= start,
+        Score.time_stamp_of_attempt < end
+    ).group_by(Score.user_id)
+
+    summaries = {}
+    for user_id, attempts, scored_sum, possible_sum in rows:
+        summaries[user_id] = {
+            'total_quizzes_taken': attempts,
+            'average_score': (scored_sum / possible_sum * 100) if possible_sum > 0 else 0
+        }
+    return summaries
+
+
+def iter_monthly_details(start, end, batch_size=1000):
+    """Yield ``(user, scores)`` for every user with attempts in [start, end).
+
+    A single joined query returns the attempts ordered by user, streamed with
+    ``yield_per`` and split per user with ``groupby``, so only one user's
+    rows are held at a time.
+    """
+    rows = db.session.query(
+        Score.user_id,
+        User.email,
+        User.full_name,
+        Quiz.name.label('quiz_name'),
+        Score.total_scored,
+        Score.total_possible,
+        Score.time_stamp_of_attempt,
+    ).join(User, Score.user_id == User.id) \
+     .outerjoin(Quiz, Score.quiz_id == Quiz.id) \
+     .filter(
+        User.role == 'user',
+        Score.time_stamp_of_attempt >= start,
+        Score.time_stamp_of_attempt < end
+    ).order_by(Score.user_id, Score.time_stamp_of_attempt) \
+     .yield_per(batch_size)
+
+    for _, user_rows in groupby(rows, key=lambda row: row.user_id):
+        scores = list(user_rows)
+        yield scores[0], scores
+
+
+def render_monthly_report(user, summary, scores, month_label):
+    html_body = f"""
+            <html>
+            <head>
+                <style>
+                    body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+                    .container {{ width: 80%; margin: 20px auto; padding: 20px; border: 1px solid #ddd; border-radius: 8px; background-color: #f9f9f9; }}
+                    h2 {{ color: #0056b3; }}
+                    table {{ width: 100%; border-collapse: collapse; margin-top: 20px; }}
+                    th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+                    th {{ background-color: #e2e6ea; }}
+                    .summary {{ margin-top: 20px; }}
+                </style>
+            </head>
+            <body>
+                <div class="container">
+                    <h2>Monthly Activity Report - {month_label}</h2>
+                    <p>Dear {user.full_name or user.email},</p>
+                    <p>Here's a summary of your activity on Quiz Master for the month of {month_label}:</p>
+
+                    <div class="summary">
+                        <p><strong>Quizzes Taken:</strong> {summary['total_quizzes_taken']}</p>
+                        <p><strong>Average Score:</strong> {summary['average_score']:.2f}%</p>
+                        </div>
+
+                    <h3>Quiz Details:</h3>
+                    <table>
+                        <thead>
+                            <tr>
+                                <th>Quiz Name</th>
+                                <th>Your Score</th>
+                                <th>Date Attempted</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+            """
+    rows = []
+    for score in scores:
+        rows.append(f"""
+                            <tr>
+                                <td>{score.quiz_name or 'Unknown Quiz'}</td>
+                                <td>{score.total_scored} / {score.total_possible}</td>
+                                <td>{score.time_stamp_of_attempt.strftime('%Y-%m-%d %H:%M')}</td>
+                            </tr>
+                """)
+    html_body += ''.join(rows)
+    html_body += """
+                        </tbody>
+                    </table>
+                    <p style="margin-top: 30px;">Keep up the great work!</p>
+                    <p>Thanks,</p>
+                    <p>Quiz Master Team</p>
+                </div>
+            </body>
+            </html>
+            """
+    return html_body
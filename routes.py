@@ -1,11 +1,43 @@
-from flask import Blueprint, request, jsonify, session, current_app
-from werkzeug.security import generate_password_hash, check_password_hash
-from models import db, User, Subject, Chapter, Quiz, Question, Score
+from flask import (
+    Blueprint, Response, request, jsonify, session, current_app, stream_with_context, send_from_directory
+)
+from redis.exceptions import RedisError
+from models import db, User, Subject, Chapter, Quiz, Question, Score, ExportJob, QuizStats
+from queries import quiz_catalog_query, quiz_detail_query, quiz_results_query
+from grading import get_answer_key, grade
+from payloads import get_attempt_payload
+from exports import iter_csv_chunks, iter_export_rows, iter_gzip
+from serializers import serialize_quiz_row, serialize_quizzes, serialize_result_row
+from search import search, DEFAULT_LIMIT as DEFAULT_SEARCH_LIMIT
+from stats import record_attempt, score_percentage, quiz_results_analytics
+from leaderboard import SCOPES as LEADERBOARD_SCOPES, record_score, top as leaderboard_top, rank_of as leaderboard_rank_of
+from score_history import first_history_page, invalidate_history, load_history_page
+from score_queue import enqueue_score, merge_pending, new_attempt_id, pending_count_for_quiz, pending_history
+from passwords import HashingBusy, hash_password, needs_rehash, verify_password
+from compression import compress_response
+from conditional import catalog_stamp, not_modified, with_validators
+from metrics import render_prometheus
+from pagination import InvalidCursor, page_args, paginate, with_next_cursor
+from question_import import InvalidQuestion, insert_questions, parse_csv, question_values, validate_questions
+import csv
+import hmac
 from functools import wraps
+from itertools import islice
 from datetime import datetime
-import os
-import csv
 api = Blueprint('api', __name__)
+api.after_request(compress_response)
+
+
+@api.errorhandler(InvalidCursor)
+def handle_invalid_cursor(e):
+    return jsonify({'message': str(e)}), 400
+
+
+@api.errorhandler(HashingBusy)
+def handle_hashing_busy(e):
+    response = jsonify({'message': 'Server is busy, please try again shortly'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
 
 
 def admin_required(f):
@@ -25,7 +57,14 @@ def login():
 
     user = User.query.filter_by(email=email).first()
 
-    if user and check_password_hash(user.password, password):
+    if user and verify_password(user.password, password):
+        if needs_rehash(user.password):
+            # Best effort: the password checked out, so a busy pool only postpones the upgrade
+            try:
+                user.password = hash_password(password)
+                db.session.commit()
+            except HashingBusy:
+                current_app.logger.info(f"Hashing pool busy, rehash of user {user.id} deferred to next login")
         session['user_id'] = user.id
         session['user_role'] = user.role
         return jsonify({'message': 'Login successful', 'user_id': user.id, 'role': user.role}), 200
@@ -59,7 +98,7 @@ def register():
     if User.query.filter_by(email=email).first():
         return jsonify({'message': 'User with this email already exists'}), 409
 
-    hashed_password = generate_password_hash(password, method='scrypt')
+    hashed_password = hash_password(password)
 
     new_user = User(
         email=email,
@@ -77,14 +116,25 @@ def register():
 @api.route('/admin/quizzes', methods=['GET'])
 @admin_required
 def get_admin_quizzes():
-    quizzes = Quiz.query.all()
-    return jsonify({'quizzes': [q.serialize() for q in quizzes]}), 200
+    stamp = catalog_stamp(Quiz, Chapter, Subject)
+    cached = not_modified(stamp)
+    if cached:
+        return cached
+    limit, cursor = page_args()
+    quizzes, next_cursor = paginate(quiz_detail_query(), [(Quiz.id, False)], limit, cursor)
+    response = jsonify({'quizzes': serialize_quizzes(quizzes), 'next_cursor': next_cursor})
+    return with_validators(with_next_cursor(response, next_cursor), stamp), 200
 
 @api.route('/admin/subjects', methods=['GET'])
 @admin_required
 def get_subjects():
-    subjects = Subject.query.all()
-    return jsonify([s.serialize() for s in subjects])
+    stamp = catalog_stamp(Subject)
+    cached = not_modified(stamp)
+    if cached:
+        return cached
+    limit, cursor = page_args()
+    subjects, next_cursor = paginate(Subject.query, [(Subject.id, False)], limit, cursor)
+    return with_validators(with_next_cursor(jsonify([s.serialize() for s in subjects]), next_cursor), stamp)
 
 @api.route('/admin/subjects', methods=['POST'])
 @admin_required
@@ -123,8 +173,13 @@ def delete_subject(id):
 @api.route('/admin/chapters', methods=['GET'])
 @admin_required
 def get_chapters():
-    chapters = Chapter.query.all()
-    return jsonify([c.serialize() for c in chapters])
+    stamp = catalog_stamp(Chapter)
+    cached = not_modified(stamp)
+    if cached:
+        return cached
+    limit, cursor = page_args()
+    chapters, next_cursor = paginate(Chapter.query, [(Chapter.id, False)], limit, cursor)
+    return with_validators(with_next_cursor(jsonify([c.serialize() for c in chapters]), next_cursor), stamp)
 
 @api.route('/admin/subjects/<int:subject_id>/chapters', methods=['GET'])
 @admin_required
@@ -204,6 +259,7 @@ def edit_quiz(id):
     quiz.chapter_id = data.get('chapter_id', quiz.chapter_id)
     quiz.time_duration = data.get('time_duration', quiz.time_duration)
     quiz.remarks = data.get('remarks', quiz.remarks)
+    Quiz.bump_content_version(id)
     db.session.commit()
     return jsonify(quiz.serialize())
 
@@ -215,6 +271,14 @@ def delete_quiz(id):
         return jsonify({'message': 'Cannot delete quiz with existing questions'}), 400
     if quiz.scores:
         return jsonify({'message': 'Cannot delete quiz with existing scores'}), 400
+    if current_app.config['SCORE_WRITE_BEHIND']:
+        try:
+            queued = pending_count_for_quiz(id)
+        except RedisError as e:
+            current_app.logger.error(f"Could not check queued scores for quiz {id}: {e}")
+            return jsonify({'message': 'Could not check for queued scores, please try again'}), 503
+        if queued > 0:
+            return jsonify({'message': 'Cannot delete quiz with scores still being saved, please try again shortly'}), 400
     db.session.delete(quiz)
     db.session.commit()
     return jsonify({'message': 'Quiz deleted'})
@@ -222,8 +286,8 @@ def delete_quiz(id):
 @api.route('/admin/quizzes/<int:quiz_id>', methods=['GET'])
 @admin_required
 def get_quiz_details(quiz_id):
-    quiz = Quiz.query.get_or_404(quiz_id)
-    return jsonify(quiz.serialize()), 200
+    row = quiz_detail_query().filter(Quiz.id == quiz_id).first_or_404()
+    return jsonify(serialize_quiz_row(row)), 200
 
 # --- Question Management---
 @api.route('/admin/quizzes/<int:quiz_id>/questions', methods=['GET'])
@@ -236,30 +300,52 @@ def get_quiz_questions(quiz_id):
 @api.route('/admin/quizzes/<int:quiz_id>/questions', methods=['POST'])
 @admin_required
 def add_question(quiz_id):
-    data = request.json
-    question_statement = data.get('question_statement')
-    options = data.get('options', [])
-    correct_option = data.get('correct_option')
-
-    if not all([question_statement, len(options) == 4, correct_option]):
-        return jsonify({'message': 'Missing data for question'}), 400
-
-    if correct_option not in options:
-        return jsonify({'message': 'Correct option must be one of the provided options'}), 400
-
-    question = Question(
-        quiz_id=quiz_id,
-        question_statement=question_statement,
-        option1=options[0],
-        option2=options[1],
-        option3=options[2],
-        option4=options[3],
-        correct_option=correct_option
-    )
+    try:
+        values = question_values(request.json)
+    except InvalidQuestion as e:
+        return jsonify({'message': str(e)}), 400
+
+    question = Question(quiz_id=quiz_id, **values)
     db.session.add(question)
+    Quiz.bump_content_version(quiz_id)
     db.session.commit()
     return jsonify(question.serialize()), 201
 
+@api.route('/admin/quizzes/<int:quiz_id>/questions/bulk', methods=['POST'])
+@admin_required
+def bulk_add_questions(quiz_id):
+    """Imports a JSON array or an uploaded CSV file; nothing is saved if any row is invalid."""
+    Quiz.query.get_or_404(quiz_id)
+    max_rows = current_app.config['QUESTION_IMPORT_MAX_ROWS']
+
+    upload = request.files.get('file')
+    try:
+        if upload is not None:
+            items = list(islice(parse_csv(upload.stream), max_rows + 1))
+        elif request.mimetype == 'text/csv':
+            items = list(islice(parse_csv(request.stream), max_rows + 1))
+        else:
+            items = request.get_json(silent=True)
+            if not isinstance(items, list):
+                return jsonify({'message': 'Expected a JSON array of questions or a CSV file'}), 400
+    except InvalidQuestion as e:
+        return jsonify({'message': str(e)}), 400
+    except (UnicodeDecodeError, csv.Error):
+        return jsonify({'message': 'Could not read CSV file'}), 400
+
+    if not items:
+        return jsonify({'message': 'No questions to import'}), 400
+    if len(items) > max_rows:
+        return jsonify({'message': f'At most {max_rows} questions can be imported at once'}), 413
+
+    rows, errors = validate_questions(quiz_id, items)
+    if errors:
+        return jsonify({'message': f'{len(errors)} invalid questions, nothing was imported', 'errors': errors}), 400
+
+    imported = insert_questions(quiz_id, rows)
+    db.session.commit()
+    return jsonify({'message': f'Imported {imported} questions', 'imported': imported}), 201
+
 @api.route('/admin/questions/<int:question_id>', methods=['PUT'])
 @admin_required
 def edit_question(question_id):
@@ -278,6 +364,7 @@ def edit_question(question_id):
     if question.correct_option not in [question.option1, question.option2, question.option3, question.option4]:
          return jsonify({'message': 'Correct option must be one of the provided options'}), 400
 
+    Quiz.bump_content_version(question.quiz_id)
     db.session.commit()
     return jsonify(question.serialize()), 200
 
@@ -286,6 +373,7 @@ def edit_question(question_id):
 def delete_question(question_id):
     question = Question.query.get_or_404(question_id)
     db.session.delete(question)
+    Quiz.bump_content_version(question.quiz_id)
     db.session.commit()
     return jsonify({'message': 'Question deleted'}), 200
 
@@ -296,22 +384,25 @@ def get_user_quizzes():
     if not user_id:
         return jsonify({'message': 'Unauthorized'}), 401
 
-    quizzes = Quiz.query.all()
+    stamp = catalog_stamp(Quiz, Chapter, Subject)
+    cached = not_modified(stamp)
+    if cached:
+        return cached
+    limit, cursor = page_args()
+    rows, next_cursor = paginate(quiz_catalog_query(), [(Quiz.id, False)], limit, cursor)
     quizzes_data = []
-    for quiz in quizzes:
-        
-        subject_name = quiz.chapter.subject.name if quiz.chapter and quiz.chapter.subject else "Unknown Subject"
-        chapter_name = quiz.chapter.name if quiz.chapter else "Unknown Chapter"
+    for row in rows:
         quizzes_data.append({
-            'id': quiz.id,
-            'name': quiz.name,
-            'subject_name': subject_name,
-            'chapter_name': chapter_name,
-            'time_duration': quiz.time_duration,
-            'remarks': quiz.remarks,
-            'date_of_quiz': quiz.date_of_quiz.strftime('%Y-%m-%d %H:%M:%S') if quiz.date_of_quiz else None
+            'id': row.id,
+            'name': row.name,
+            'subject_name': row.subject_name or "Unknown Subject",
+            'chapter_name': row.chapter_name or "Unknown Chapter",
+            'time_duration': row.time_duration,
+            'remarks': row.remarks,
+            'date_of_quiz': row.date_of_quiz.strftime('%Y-%m-%d %H:%M:%S') if row.date_of_quiz else None
         })
-    return jsonify({'quizzes': quizzes_data}), 200
+    response = jsonify({'quizzes': quizzes_data, 'next_cursor': next_cursor})
+    return with_validators(with_next_cursor(response, next_cursor), stamp), 200
 
 
 @api.route('/quizzes/<int:quiz_id>/attempt', methods=['GET'])
@@ -321,20 +412,12 @@ def get_quiz_for_attempt(quiz_id):
         return jsonify({'message': 'Unauthorized'}), 401
 
     quiz = Quiz.query.get_or_404(quiz_id)
-    questions = Question.query.filter_by(quiz_id=quiz_id).all()
-
-    questions_for_user = []
-    for q in questions:
-        q_data = q.serialize()
-        q_data.pop('correct_option', None)
-        questions_for_user.append(q_data)
+    body, etag = get_attempt_payload(quiz)
 
-    return jsonify({
-        'quiz_id': quiz.id,
-        'quiz_name': quiz.name,
-        'time_duration': quiz.time_duration,
-        'questions': questions_for_user
-    }), 200
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
 
 @api.route('/quizzes/<int:quiz_id>/submit', methods=['POST'])
 def submit_quiz(quiz_id):
@@ -346,35 +429,111 @@ def submit_quiz(quiz_id):
     user_answers = data.get('answers', {})
 
     quiz = Quiz.query.get_or_404(quiz_id)
-    questions = {q.id: q for q in Question.query.filter_by(quiz_id=quiz_id).all()}
-
-    total_correct = 0
-    total_questions = len(questions)
-
-    for q_id_str, submitted_answer in user_answers.items():
-        q_id = int(q_id_str)
-        if q_id in questions:
-            correct_answer = questions[q_id].correct_option
-            if submitted_answer == correct_answer:
-                total_correct += 1
-
-    new_score = Score(
-        quiz_id=quiz_id,
-        user_id=user_id,
-        time_stamp_of_attempt=datetime.utcnow(),
-        total_scored=total_correct,
-        total_possible=total_questions
-    )
-    db.session.add(new_score)
-    db.session.commit()
+    answer_key = get_answer_key(quiz)
+
+    total_correct = grade(answer_key, user_answers)
+    total_questions = len(answer_key)
+    attempt_id = new_attempt_id()
+    attempted_at = datetime.utcnow()
+
+    chapter_id = quiz.chapter_id
+    chapter = db.session.query(Chapter.subject_id, Chapter.name, Subject.name.label('subject_name')) \
+        .outerjoin(Subject, Chapter.subject_id == Subject.id).filter(Chapter.id == chapter_id).first()
+    subject_id = chapter.subject_id if chapter else None
+
+    score_id = None
+    pending = False
+    if current_app.config['SCORE_WRITE_BEHIND']:
+        try:
+            enqueue_score({
+                'attempt_id': attempt_id,
+                'quiz_id': quiz_id,
+                'user_id': user_id,
+                'time_stamp_of_attempt': attempted_at.isoformat(),
+                'total_scored': total_correct,
+                'total_possible': total_questions
+            }, {
+                'score_id': None,
+                'attempt_id': attempt_id,
+                'quiz_name': quiz.name,
+                'chapter_name': chapter.name if chapter else None,
+                'subject_name': chapter.subject_name if chapter else None,
+                'scored': total_correct,
+                'total_possible': total_questions,
+                'attempt_date': attempted_at.strftime('%Y-%m-%d %H:%M:%S'),
+                'pending': True
+            })
+            pending = True
+        except RedisError as e:
+            current_app.logger.warning(f"Score queue unavailable, writing attempt {attempt_id} directly: {e}")
+
+    if not pending:
+        new_score = Score(
+            attempt_id=attempt_id,
+            quiz_id=quiz_id,
+            user_id=user_id,
+            time_stamp_of_attempt=attempted_at,
+            total_scored=total_correct,
+            total_possible=total_questions
+        )
+        db.session.add(new_score)
+        record_attempt(quiz_id, total_correct, total_questions)
+        db.session.commit()
+        score_id = new_score.id
+        invalidate_history(user_id)
+
+    try:
+        record_score(quiz_id, chapter_id, subject_id, user_id, score_percentage(total_correct, total_questions))
+    except RedisError as e:
+        current_app.logger.warning(f"Could not update leaderboards for quiz {quiz_id}: {e}")
 
     return jsonify({
         'message': 'Quiz submitted successfully',
         'score': total_correct,
         'total_questions': total_questions,
-        'score_id': new_score.id
+        'score_id': score_id,
+        'attempt_id': attempt_id,
+        'pending': pending
     }), 200
 
+@api.route('/admin/quizzes/<int:quiz_id>/summary', methods=['GET'])
+@admin_required
+def get_quiz_summary(quiz_id):
+    stats = db.session.get(QuizStats, quiz_id)
+    if stats is None:
+        Quiz.query.get_or_404(quiz_id)
+        stats = QuizStats(quiz_id=quiz_id, attempts=0, score_sum=0, score_sq_sum=0)
+    return jsonify(stats.serialize()), 200
+
+# --- Leaderboards ---
+@api.route('/leaderboards/<scope>/<int:scope_id>', methods=['GET'])
+def get_leaderboard(scope, scope_id):
+    if not session.get('user_id'):
+        return jsonify({'message': 'Unauthorized'}), 401
+    if scope not in LEADERBOARD_SCOPES:
+        return jsonify({'message': 'Unknown leaderboard'}), 404
+    limit = max(1, min(request.args.get('limit', 10, type=int), current_app.config['API_MAX_PAGE_SIZE']))
+    try:
+        entries = leaderboard_top(scope, scope_id, limit)
+    except RedisError as e:
+        current_app.logger.error(f"Leaderboard unavailable: {e}")
+        return jsonify({'message': 'Leaderboard is temporarily unavailable'}), 503
+    return jsonify({'scope': scope, 'id': scope_id, 'entries': entries}), 200
+
+@api.route('/leaderboards/<scope>/<int:scope_id>/me', methods=['GET'])
+def get_my_leaderboard_rank(scope, scope_id):
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'message': 'Unauthorized'}), 401
+    if scope not in LEADERBOARD_SCOPES:
+        return jsonify({'message': 'Unknown leaderboard'}), 404
+    try:
+        position = leaderboard_rank_of(scope, scope_id, user_id)
+    except RedisError as e:
+        current_app.logger.error(f"Leaderboard unavailable: {e}")
+        return jsonify({'message': 'Leaderboard is temporarily unavailable'}), 503
+    return jsonify({'scope': scope, 'id': scope_id, **position}), 200
+
 # --- User Score History ---
 @api.route('/user/scores', methods=['GET'])
 def get_user_scores():
@@ -382,18 +541,23 @@ def get_user_scores():
     if not user_id:
         return jsonify({'message': 'Unauthorized'}), 401
 
-    scores = Score.query.filter_by(user_id=user_id).order_by(Score.time_stamp_of_attempt.desc()).all()
-    results = []
-    for score in scores:
-        quiz = Quiz.query.get(score.quiz_id)
-        results.append({
-            'score_id': score.id,
-            'quiz_name': quiz.name if quiz else 'Unknown Quiz',
-            'scored': score.total_scored,
-            'total_possible': score.total_possible,
-            'attempt_date': score.time_stamp_of_attempt.strftime('%Y-%m-%d %H:%M:%S')
-        })
-    return jsonify(results), 200
+    limit, cursor = page_args()
+    # Attempts still waiting in the write-behind queue lead the first page
+    pending = []
+    if cursor is None and current_app.config['SCORE_WRITE_BEHIND']:
+        try:
+            pending = pending_history(user_id)
+        except RedisError as e:
+            current_app.logger.warning(f"Could not read pending scores for user {user_id}: {e}")
+
+    if cursor is None and limit == current_app.config['API_PAGE_SIZE']:
+        body, next_cursor = first_history_page(user_id)
+        if not pending:
+            return with_next_cursor(Response(body, mimetype='application/json'), next_cursor), 200
+        results = current_app.json.loads(body)
+    else:
+        results, next_cursor = load_history_page(user_id, limit, cursor)
+    return with_next_cursor(jsonify(merge_pending(results, pending)), next_cursor), 200
 
 
 # --- View Quiz--
@@ -401,21 +565,18 @@ def get_user_scores():
 @admin_required
 def get_quiz_results(quiz_id):
     quiz = Quiz.query.get_or_404(quiz_id)
-    scores = Score.query.filter_by(quiz_id=quiz_id).all()
-    results = []
-    for score in scores:
-        user = User.query.get(score.user_id)
-        results.append({
-            'user_name': user.full_name if user else 'Unknown User',
-            'user_email': user.email if user else 'N/A',
-            'scored': score.total_scored,
-            'total_possible': score.total_possible,
-            'attempt_date': score.time_stamp_of_attempt.strftime('%Y-%m-%d %H:%M:%S')
-        })
-    return jsonify({
+    limit, cursor = page_args()
+    rows, next_cursor = paginate(quiz_results_query(quiz_id), [(Score.id, False)], limit, cursor)
+    payload = {
         'quiz_name': quiz.name,
-        'results': results
-    }), 200
+        'results': [serialize_result_row(row) for row in rows],
+        'next_cursor': next_cursor
+    }
+    if request.args.get('analytics', type=int):
+        pass_percentage = request.args.get('pass_percentage', current_app.config['PASS_PERCENTAGE'], type=float)
+        payload['analytics'] = quiz_results_analytics(quiz_id, pass_percentage)
+    response = jsonify(payload)
+    return with_next_cursor(response, next_cursor), 200
 
 
 
@@ -426,23 +587,8 @@ def admin_search():
     if not query:
         return jsonify({'message': 'Search query is required'}), 400
 
-    results = {}
-    users = User.query.filter(
-        (User.full_name.ilike(f'%{query}%')) |
-        (User.email.ilike(f'%{query}%'))
-    ).all()
-    results['users'] = [u.serialize() for u in users]
-    subjects = Subject.query.filter(
-        (Subject.name.ilike(f'%{query}%')) |
-        (Subject.description.ilike(f'%{query}%'))
-    ).all()
-    results['subjects'] = [s.serialize() for s in subjects]
-    quizzes = Quiz.query.filter(
-        (Quiz.name.ilike(f'%{query}%')) |
-        (Quiz.remarks.ilike(f'%{query}%'))
-    ).all()
-    results['quizzes'] = [q.serialize() for q in quizzes]
-
+    limit = request.args.get('limit', DEFAULT_SEARCH_LIMIT, type=int)
+    results = search(query, limit)
     return jsonify(results), 200
 
 
@@ -450,62 +596,79 @@ def admin_search():
 @api.route('/admin/export-scores', methods=['POST'])
 @admin_required
 def export_scores():
-    try:
-        scores = Score.query.all()
-        users = {u.id: u for u in User.query.all()}
-        quizzes = {q.id: q for q in Quiz.query.all()}
-        chapters = {c.id: c for c in Chapter.query.all()}
-        subjects = {s.id: s for s in Subject.query.all()}
-
-        static_folder = os.path.join(current_app.root_path, 'static')
-        if not os.path.exists(static_folder):
-            os.makedirs(static_folder)
-
-        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-        filename = f'all_quiz_scores_{timestamp}.csv'
-        filepath = os.path.join(static_folder, filename)
-
-        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = [
-                'Score ID', 'User Email', 'User Full Name', 'Quiz Name',
-                'Subject Name', 'Chapter Name', 'Score', 'Total Possible', 'Attempt Date'
-            ]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-            writer.writeheader()
-            for score in scores:
-                user = users.get(score.user_id)
-                quiz = quizzes.get(score.quiz_id)
-
-                user_email = user.email if user else 'N/A'
-                user_full_name = user.full_name if user else 'N/A'
-                quiz_name = quiz.name if quiz else 'N/A'
-                time_duration = quiz.time_duration if quiz else 'N/A'
-                remarks = quiz.remarks if quiz else 'N/A'
-
-                subject_name = 'N/A'
-                chapter_name = 'N/A'
-
-                if quiz and quiz.chapter_id:
-                    chapter = chapters.get(quiz.chapter_id)
-                    chapter_name = chapter.name if chapter else 'N/A'
-                    if chapter and chapter.subject_id:
-                        subject = subjects.get(chapter.subject_id)
-                        subject_name = subject.name if subject else 'N/A'
-
-                writer.writerow({
-                    'Score ID': score.id,
-                    'User Email': user_email,
-                    'User Full Name': user_full_name,
-                    'Quiz Name': quiz_name,
-                    'Subject Name': subject_name,
-                    'Chapter Name': chapter_name,
-                    'Score': score.total_scored,
-                    'Total Possible': score.total_possible,
-                    'Attempt Date': score.time_stamp_of_attempt.strftime('%Y-%m-%d %H:%M:%S')
-                })
-        return jsonify({'message': 'Scores exported successfully!', 'filepath': f'/static/{filename}'}), 200
+    """Queues a background export job; poll /admin/export-jobs/<id> for progress."""
+    from tasks import export_scores_job
 
+    job = ExportJob(user_id=session['user_id'])
+    db.session.add(job)
+    db.session.commit()
+
+    try:
+        result = export_scores_job.delay(job.id)
     except Exception as e:
-        current_app.logger.error(f"Error exporting scores: {e}")
-        return jsonify({'error':'An internal server error occurred during export.'}, 500)
\ No newline at end of file
+        current_app.logger.error(f"Error queueing export job {job.id}: {e}")
+        job.status = 'failed'
+        job.error = 'Could not queue export job'
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+        return jsonify({'message': 'Export service is unavailable, please try again later.'}), 503
+
+    job.task_id = result.id
+    db.session.commit()
+    return jsonify({'message': 'Export started', 'job': job.serialize()}), 202
+
+@api.route('/admin/export-jobs/<int:job_id>', methods=['GET'])
+@admin_required
+def get_export_job(job_id):
+    job = ExportJob.query.get_or_404(job_id)
+    return jsonify(job.serialize()), 200
+
+@api.route('/admin/export-jobs/<int:job_id>/cancel', methods=['POST'])
+@admin_required
+def cancel_export_job(job_id):
+    job = ExportJob.query.get_or_404(job_id)
+    if job.is_finished:
+        return jsonify({'message': f'Export job already {job.status}'}), 409
+    job.cancel_requested = True
+    db.session.commit()
+    return jsonify(job.serialize()), 200
+
+@api.route('/admin/export-jobs/<int:job_id>/download', methods=['GET'])
+@admin_required
+def download_export_job(job_id):
+    job = ExportJob.query.get_or_404(job_id)
+    if job.status != 'completed' or not job.filename:
+        return jsonify({'message': 'Export is not ready'}), 409
+    return send_from_directory(current_app.config['EXPORT_DIR'], job.filename, as_attachment=True)
+
+@api.route('/admin/export-scores', methods=['GET'])
+@admin_required
+def stream_export_scores():
+    """Streams the score export as a chunked CSV download, gzip-encoded if the client accepts it."""
+    batch_size = current_app.config['EXPORT_BATCH_SIZE']
+    timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+    chunks = iter_csv_chunks(iter_export_rows(batch_size), batch_size)
+
+    headers = {'Content-Disposition': f'attachment; filename=all_quiz_scores_{timestamp}.csv'}
+    if 'gzip' in request.accept_encodings:
+        chunks = iter_gzip(chunks)
+        headers['Content-Encoding'] = 'gzip'
+    headers['Vary'] = 'Accept-Encoding'
+    return Response(stream_with_context(chunks), mimetype='text/csv', headers=headers)
+
+# --- Metrics ---
+@api.route('/admin/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus text exposition; open to admins and to scrapers presenting METRICS_TOKEN."""
+    token = current_app.config['METRICS_TOKEN']
+    # Compare bytes: compare_digest rejects non-ASCII str. Headers arrive latin-1 decoded.
+    presented = request.headers.get('Authorization', '').encode('latin-1')
+    scraper = token and hmac.compare_digest(presented, f'Bearer {token}'.encode('utf-8'))
+    if not scraper and session.get('user_role') != 'admin':
+        return jsonify({'message': 'Admin access required'}), 403
+    try:
+        body = render_prometheus()
+    except RedisError as e:
+        current_app.logger.error(f"Metrics unavailable: {e}")
+        return jsonify({'message': 'Metrics are temporarily unavailable'}), 503
+    return Response(body, mimetype='text/plain; version=0.0.4'), 200
@@ -0,0 +1,62 @@
+"""Per-user score history, with the default first page cached in Redis.
+
+The first page is what the scores view loads on every visit, so it is kept
+as ready-to-send JSON under ``score_history:<user_id>``. submit_quiz drops
+the entry after committing a new attempt. The page includes quiz, chapter
+and subject names, so it is stored with the catalog stamp it was built
+under and rebuilt when an admin edit has changed the stamp. Later pages
+(requests with a cursor or a non-default limit) always go to the
+database. Redis failures fall back to the database transparently.
+"""
+from flask import current_app
+from redis.exceptions import RedisError
+
+from conditional import catalog_stamp
+from models import Score, Quiz, Chapter, Subject
+from pagination import paginate
+from queries import score_history_query
+from redis_store import get_redis
+from serializers import serialize_history_row
+
+
+HISTORY_ORDER = [(Score.time_stamp_of_attempt, True), (Score.id, True)]
+
+
+def history_cache_key(user_id):
+    return f'score_history:{user_id}'
+
+
+def load_history_page(user_id, limit, cursor=None):
+    rows, next_cursor = paginate(score_history_query(user_id), HISTORY_ORDER, limit, cursor)
+    return [serialize_history_row(row) for row in rows], next_cursor
+
+
+def first_history_page(user_id):
+    """Return ``(json_bytes, next_cursor)`` for the default first page."""
+    key = history_cache_key(user_id)
+    stamp = catalog_stamp(Quiz, Chapter, Subject).etag
+    try:
+        cached = get_redis().hgetall(key)
+    except RedisError as e:
+        current_app.logger.warning(f"Score history cache unavailable: {e}")
+        cached = None
+    if cached and cached.get('catalog') == stamp:
+        return cached['body'].encode('utf-8'), cached.get('next_cursor') or None
+
+    results, next_cursor = load_history_page(user_id, current_app.config['API_PAGE_SIZE'])
+    body = current_app.json.dumps(results)
+    try:
+        pipe = get_redis().pipeline()
+        pipe.hset(key, mapping={'body': body, 'next_cursor': next_cursor or '', 'catalog': stamp})
+        pipe.expire(key, current_app.config['SCORE_HISTORY_CACHE_TTL'])
+        pipe.execute()
+    except RedisError as e:
+        current_app.logger.warning(f"Could not cache score history for user {user_id}: {e}")
+    return body.encode('utf-8'), next_cursor
+
+
+def invalidate_history(user_id):
+    try:
+        get_redis().delete(history_cache_key(user_id))
+    except RedisError as e:
+        current_app.logger.warning(f"Could not invalidate score history for user {user_id}: {e}")
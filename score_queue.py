@@ -0,0 +1,190 @@
+"""Write-behind queue for quiz scores (``SCORE_WRITE_BEHIND``).
+
+When enabled, submit_quiz grades the attempt, pushes it onto a Redis list
+and answers straight away with the attempt's ``attempt_id``; no database
+write happens on the request path. ``flush_pending_scores`` (run by Celery
+beat) moves queued attempts into ``scores:processing`` and inserts them,
+with their QuizStats updates, one batch per transaction.
+
+Each attempt is also kept in a per-user hash until it has been written, so
+the user's own score history can include attempts that are still queued,
+and counted per quiz so a quiz with queued attempts can't be deleted.
+A batch left in ``scores:processing`` by a crashed flush is retried first;
+``Score.attempt_id`` is unique and already-written attempts are skipped,
+so a retry never records an attempt twice. If a batch fails to insert it
+is retried row by row, and rows that still fail (or whose quiz has
+disappeared) move to the ``scores:dead`` list with the error instead of
+blocking the queue. Connection and lock errors are not row problems: they
+leave the batch in place for the next run. Durability of queued attempts
+is that of the Redis server (enable AOF persistence in production).
+"""
+import json
+import uuid
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+
+from models import db, Quiz, Score
+from redis_store import get_redis
+from score_history import invalidate_history
+from stats import record_attempt
+
+
+QUEUE_KEY = 'scores:pending'
+PROCESSING_KEY = 'scores:processing'
+DEAD_LETTER_KEY = 'scores:dead'
+QUIZ_COUNTS_KEY = 'scores:pending:quizzes'
+FLUSH_LOCK_KEY = 'scores:flush-lock'
+FLUSH_LOCK_TIMEOUT = 60
+
+
+def user_pending_key(user_id):
+    return f'scores:pending:user:{user_id}'
+
+
+def new_attempt_id():
+    return uuid.uuid4().hex
+
+
+def enqueue_score(record, history_entry):
+    """Queue a graded attempt; ``history_entry`` is what the user's history shows meanwhile."""
+    pipe = get_redis().pipeline()
+    pipe.hset(user_pending_key(record['user_id']), record['attempt_id'], json.dumps(history_entry))
+    pipe.hincrby(QUIZ_COUNTS_KEY, record['quiz_id'], 1)
+    pipe.lpush(QUEUE_KEY, json.dumps(record))
+    pipe.execute()
+
+
+def pending_count_for_quiz(quiz_id):
+    # Attempts queued before the count existed are decremented without an increment
+    return max(0, int(get_redis().hget(QUIZ_COUNTS_KEY, quiz_id) or 0))
+
+
+def pending_history(user_id):
+    """The user's queued attempts, newest first."""
+    entries = [json.loads(value) for value in get_redis().hvals(user_pending_key(user_id))]
+    entries.sort(key=lambda entry: entry['attempt_date'], reverse=True)
+    return entries
+
+
+def merge_pending(results, pending):
+    """Put queued attempts ahead of a history page, dropping any that were flushed meanwhile."""
+    if not pending:
+        return results
+    written = {result.get('attempt_id') for result in results}
+    return [entry for entry in pending if entry['attempt_id'] not in written] + results
+
+
+def _claim_batch(redis_client, batch_size):
+    pipe = redis_client.pipeline(transaction=False)
+    for _ in range(batch_size):
+        pipe.rpoplpush(QUEUE_KEY, PROCESSING_KEY)
+    return [payload for payload in pipe.execute() if payload is not None]
+
+
+def _write_batch(records):
+    """Insert the attempts not yet written and fold them into QuizStats, in one transaction.
+
+    Returns ``(written, dead)``; attempts at quizzes that no longer exist are
+    returned as dead rather than inserted.
+    """
+    attempt_ids = [record['attempt_id'] for record in records]
+    written = set(db.session.scalars(select(Score.attempt_id).where(Score.attempt_id.in_(attempt_ids))))
+    quiz_ids = {record['quiz_id'] for record in records}
+    live_quizzes = set(db.session.scalars(select(Quiz.id).where(Quiz.id.in_(quiz_ids))))
+
+    dead = [(record, 'quiz no longer exists') for record in records if record['quiz_id'] not in live_quizzes]
+    new_records = [record for record in records
+                   if record['attempt_id'] not in written and record['quiz_id'] in live_quizzes]
+    if new_records:
+        db.session.execute(insert(Score), [
+            {
+                'attempt_id': record['attempt_id'],
+                'quiz_id': record['quiz_id'],
+                'user_id': record['user_id'],
+                'time_stamp_of_attempt': datetime.fromisoformat(record['time_stamp_of_attempt']),
+                'total_scored': record['total_scored'],
+                'total_possible': record['total_possible'],
+            }
+            for record in new_records
+        ])
+        for record in new_records:
+            record_attempt(record['quiz_id'], record['total_scored'], record['total_possible'])
+    db.session.commit()
+    return len(new_records), dead
+
+
+def _write_records(records):
+    """``_write_batch``, falling back to one transaction per row if the batch fails.
+
+    OperationalError (connection lost, database locked) is re-raised so the
+    batch stays in ``scores:processing``; any other error is blamed on the row.
+    """
+    try:
+        return _write_batch(records)
+    except OperationalError:
+        db.session.rollback()
+        raise
+    except Exception as e:
+        db.session.rollback()
+        if len(records) == 1:
+            return 0, [(records[0], f"{type(e).__name__}: {e}")]
+        current_app.logger.warning(f"Score batch failed, retrying row by row: {e}")
+
+    written, dead = 0, []
+    for record in records:
+        row_written, row_dead = _write_records([record])
+        written += row_written
+        dead += row_dead
+    return written, dead
+
+
+def _release(redis_client, records, dead):
+    """Forget a processed batch: pending entries, per-quiz counts and the processing list."""
+    users, quizzes = {}, {}
+    for record in records:
+        users.setdefault(record['user_id'], []).append(record['attempt_id'])
+        quizzes[record['quiz_id']] = quizzes.get(record['quiz_id'], 0) + 1
+    for user_id in users:
+        invalidate_history(user_id)
+
+    pipe = redis_client.pipeline()
+    for user_id, user_attempts in users.items():
+        pipe.hdel(user_pending_key(user_id), *user_attempts)
+    for quiz_id, count in quizzes.items():
+        pipe.hincrby(QUIZ_COUNTS_KEY, quiz_id, -count)
+    for record, error in dead:
+        pipe.lpush(DEAD_LETTER_KEY, json.dumps({
+            'record': record, 'error': error, 'failed_at': datetime.utcnow().isoformat()
+        }))
+    pipe.delete(PROCESSING_KEY)
+    pipe.expire(FLUSH_LOCK_KEY, FLUSH_LOCK_TIMEOUT)
+    pipe.execute()
+
+
+def flush_pending_scores(batch_size=None):
+    """Write queued attempts to the database until the queue is empty; returns the number written."""
+    batch_size = batch_size or current_app.config['SCORE_FLUSH_BATCH_SIZE']
+    redis_client = get_redis()
+    token = uuid.uuid4().hex
+    if not redis_client.set(FLUSH_LOCK_KEY, token, nx=True, ex=FLUSH_LOCK_TIMEOUT):
+        return 0
+
+    flushed = 0
+    try:
+        while True:
+            payloads = redis_client.lrange(PROCESSING_KEY, 0, -1) or _claim_batch(redis_client, batch_size)
+            if not payloads:
+                break
+            records = [json.loads(payload) for payload in payloads]
+            written, dead = _write_records(records)
+            flushed += written
+            for record, error in dead:
+                current_app.logger.error(f"Moved score attempt {record['attempt_id']} to {DEAD_LETTER_KEY}: {error}")
+            _release(redis_client, records, dead)
+    finally:
+        if redis_client.get(FLUSH_LOCK_KEY) == token:
+            redis_client.delete(FLUSH_LOCK_KEY)
+    return flushed
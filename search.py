@@ -0,0 +1,150 @@
+"""Full-text search for the admin search box.
+
+On SQLite the ``search_index`` FTS5 table holds one document per user,
+subject and quiz. Triggers on the source tables keep it in sync, so every
+writer (admin CRUD routes, registration, scripts) is covered. Each
+document's rowid encodes its source row as ``id * 8 + kind``, which lets the
+triggers and the result loader address documents without scanning the
+index. Databases without FTS5 fall back to the original ``ilike`` search.
+"""
+import re
+
+from sqlalchemy import text
+
+from migrations import migration
+from models import db, User, Subject, Quiz
+from queries import quiz_detail_query, user_listing_query, subject_listing_query
+from serializers import serialize_quiz_row, serialize_user_row, serialize_subject_row
+
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# kind code -> (result key, source table, title column, body expression)
+ENTITIES = {
+    1: ('users', '"user"', 'full_name', 'email'),
+    2: ('subjects', 'subject', 'name', 'description'),
+    3: ('quizzes', 'quiz', 'name', 'remarks'),
+}
+TRIGGER_COLUMNS = {1: 'full_name, email', 2: 'name, description', 3: 'name, remarks'}
+LOADERS = {
+    1: (User, user_listing_query, serialize_user_row),
+    2: (Subject, subject_listing_query, serialize_subject_row),
+    3: (Quiz, quiz_detail_query, serialize_quiz_row),
+}
+
+
+def _trigger_statements(kind):
+    _, table, title, body = ENTITIES[kind]
+    name = table.strip('"')
+    insert = (
+        f"INSERT INTO search_index(rowid, title, body) "
+        f"VALUES (new.id * 8 + {kind}, new.{title}, new.{body});"
+    )
+    delete = f"DELETE FROM search_index WHERE rowid = old.id * 8 + {kind};"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS search_{name}_ai AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS search_{name}_au AFTER UPDATE OF {TRIGGER_COLUMNS[kind]} ON {table} "
+        f"BEGIN {delete} {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS search_{name}_ad AFTER DELETE ON {table} BEGIN {delete} END",
+    ]
+
+
+def _fts5_supported(connection):
+    if connection.dialect.name != 'sqlite':
+        return False
+    options = {row[0] for row in connection.execute(text("PRAGMA compile_options"))}
+    return 'ENABLE_FTS5' in options
+
+
+def rebuild_search_index(connection):
+    """(Re)create the FTS table and triggers and repopulate it from the source tables."""
+    if not _fts5_supported(connection):
+        return False
+    connection.execute(text("DROP TABLE IF EXISTS search_index"))
+    connection.execute(text(
+        "CREATE VIRTUAL TABLE search_index USING fts5(title, body, tokenize='unicode61', prefix='2 3')"
+    ))
+    for kind, (_, table, title, body) in ENTITIES.items():
+        for statement in _trigger_statements(kind):
+            connection.execute(text(statement))
+        connection.execute(text(
+            f"INSERT INTO search_index(rowid, title, body) SELECT id * 8 + {kind}, {title}, {body} FROM {table}"
+        ))
+    return True
+
+
+@migration('create_search_index')
+def create_search_index(connection):
+    rebuild_search_index(connection)
+
+
+def search_index_ready():
+    if db.engine.dialect.name != 'sqlite':
+        return False
+    return db.session.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'"
+    )).first() is not None
+
+
+def build_match_query(query):
+    """Turn free text into an FTS5 query: every word must match as a prefix."""
+    terms = re.findall(r'\w+', query)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def _ranked_ids(match, kind, limit):
+    rows = db.session.execute(text(
+        "SELECT rowid FROM search_index "
+        "WHERE search_index MATCH :match AND rowid % 8 = :kind "
+        "ORDER BY bm25(search_index, 10.0, 1.0) LIMIT :limit"
+    ), {'match': match, 'kind': kind, 'limit': limit})
+    return [rowid // 8 for (rowid,) in rows]
+
+
+def _in_rank_order(ids, rows):
+    by_id = {row.id: row for row in rows}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def fts_search(query, limit):
+    results = {key: [] for key, _, _, _ in ENTITIES.values()}
+    match = build_match_query(query)
+    if not match:
+        return results
+
+    for kind, (key, _, _, _) in ENTITIES.items():
+        ids = _ranked_ids(match, kind, limit)
+        if not ids:
+            continue
+        model, listing_query, serialize = LOADERS[kind]
+        rows = listing_query().filter(model.id.in_(ids))
+        results[key] = [serialize(row) for row in _in_rank_order(ids, rows)]
+    return results
+
+
+def like_search(query, limit):
+    users = user_listing_query().filter(
+        (User.full_name.ilike(f'%{query}%')) |
+        (User.email.ilike(f'%{query}%'))
+    ).order_by(User.id).limit(limit)
+    subjects = subject_listing_query().filter(
+        (Subject.name.ilike(f'%{query}%')) |
+        (Subject.description.ilike(f'%{query}%'))
+    ).order_by(Subject.id).limit(limit)
+    quizzes = quiz_detail_query().filter(
+        (Quiz.name.ilike(f'%{query}%')) |
+        (Quiz.remarks.ilike(f'%{query}%'))
+    ).order_by(Quiz.id).limit(limit)
+    return {
+        'users': [serialize_user_row(r) for r in users],
+        'subjects': [serialize_subject_row(r) for r in subjects],
+        'quizzes': [serialize_quiz_row(r) for r in quizzes],
+    }
+
+
+def search(query, limit=DEFAULT_LIMIT):
+    limit = max(1, min(limit, MAX_LIMIT))
+    if search_index_ready():
+        return fts_search(query, limit)
+    return like_search(query, limit)
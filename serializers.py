@@ -0,0 +1,70 @@
+"""Serializers that turn whole result sets into response dicts.
+
+Unlike ``Model.serialize()``, these work on the row tuples returned by the
+joined queries in ``queries.py``, so related names are already present on
+each row and no lazy load is triggered while building a listing. The keys
+match the corresponding ``serialize()`` methods in models.py. Dates are
+left as ``date``/``datetime`` objects; the app's JSON provider writes them
+as ISO 8601.
+"""
+
+
+def serialize_quiz_row(row):
+    return {
+        'id': row.id,
+        'name': row.name,
+        'chapter_id': row.chapter_id,
+        'date_of_quiz': row.date_of_quiz,
+        'time_duration': row.time_duration,
+        'remarks': row.remarks,
+        'created_at': row.created_at,
+        'chapter_name': row.chapter_name,
+        'subject_name': row.subject_name
+    }
+
+
+def serialize_user_row(row):
+    return {
+        'id': row.id,
+        'email': row.email,
+        'full_name': row.full_name,
+        'qualification': row.qualification,
+        'dob': row.dob,
+        'role': row.role
+    }
+
+
+def serialize_subject_row(row):
+    return {
+        'id': row.id,
+        'name': row.name,
+        'description': row.description,
+        'created_at': row.created_at
+    }
+
+
+def serialize_quizzes(query):
+    return [serialize_quiz_row(row) for row in query]
+
+
+def serialize_history_row(row):
+    return {
+        'score_id': row.id,
+        'attempt_id': row.attempt_id,
+        'quiz_name': row.quiz_name or 'Unknown Quiz',
+        'chapter_name': row.chapter_name,
+        'subject_name': row.subject_name,
+        'scored': row.total_scored,
+        'total_possible': row.total_possible,
+        'attempt_date': row.time_stamp_of_attempt.strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def serialize_result_row(row):
+    return {
+        'user_name': row.full_name or 'Unknown User',
+        'user_email': row.email or 'N/A',
+        'scored': row.total_scored,
+        'total_possible': row.total_possible,
+        'attempt_date': row.time_stamp_of_attempt.strftime('%Y-%m-%d %H:%M:%S')
+    }
@@ -0,0 +1,152 @@
+import math
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from migrations import migration
+from models import db, QuizStats, Score
+
+
+def score_percentage(scored, possible):
+    return scored * 100.0 / possible if possible else 0.0
+
+
+def score_percentage_expr():
+    """SQL equivalent of ``score_percentage`` over the Score table."""
+    return case(
+        (Score.total_possible > 0, Score.total_scored * 100.0 / Score.total_possible),
+        else_=0.0
+    )
+
+
+def histogram_bucket(percentage):
+    return min(int(percentage // 10), QuizStats.HISTOGRAM_BUCKETS - 1)
+
+
+def histogram_bucket_counts(percentage):
+    """One SUM(CASE ...) per histogram bucket, matching ``histogram_bucket``."""
+    counts = []
+    for i in range(QuizStats.HISTOGRAM_BUCKETS):
+        in_bucket = percentage >= i * 10
+        if i < QuizStats.HISTOGRAM_BUCKETS - 1:
+            in_bucket = in_bucket & (percentage < (i + 1) * 10)
+        counts.append(func.coalesce(func.sum(case((in_bucket, 1), else_=0)), 0))
+    return counts
+
+
+def record_attempt(quiz_id, scored, possible):
+    """Fold one attempt into the quiz's QuizStats row.
+
+    Runs as a single atomic UPDATE in the caller's transaction, so
+    concurrent submissions can't lose increments. The first attempt inserts
+    the row inside a savepoint; if another request inserted it first, the
+    UPDATE is simply retried.
+    """
+    percentage = score_percentage(scored, possible)
+    bucket = f'bucket_{histogram_bucket(percentage)}'
+    values = {
+        QuizStats.attempts: QuizStats.attempts + 1,
+        QuizStats.score_sum: QuizStats.score_sum + percentage,
+        QuizStats.score_sq_sum: QuizStats.score_sq_sum + percentage * percentage,
+        QuizStats.min_score: case(
+            (QuizStats.min_score.is_(None), percentage),
+            (QuizStats.min_score > percentage, percentage),
+            else_=QuizStats.min_score
+        ),
+        QuizStats.max_score: case(
+            (QuizStats.max_score.is_(None), percentage),
+            (QuizStats.max_score < percentage, percentage),
+            else_=QuizStats.max_score
+        ),
+        getattr(QuizStats, bucket): getattr(QuizStats, bucket) + 1,
+    }
+    stats_query = QuizStats.query.filter_by(quiz_id=quiz_id)
+    if stats_query.update(values, synchronize_session=False):
+        return
+
+    try:
+        with db.session.begin_nested():
+            stats = QuizStats(
+                quiz_id=quiz_id, attempts=1, score_sum=percentage, score_sq_sum=percentage * percentage,
+                min_score=percentage, max_score=percentage,
+                **{f'bucket_{i}': 0 for i in range(QuizStats.HISTOGRAM_BUCKETS)}
+            )
+            setattr(stats, bucket, 1)
+            db.session.add(stats)
+    except IntegrityError:
+        stats_query.update(values, synchronize_session=False)
+
+
+def rebuild_quiz_stats(connection):
+    """Recompute every QuizStats row from the Score table in one grouped INSERT ... SELECT."""
+    percentage = score_percentage_expr()
+    bucket_counts = histogram_bucket_counts(percentage)
+
+    aggregates = select(
+        Score.quiz_id,
+        func.count(Score.id),
+        func.sum(percentage),
+        func.sum(percentage * percentage),
+        func.min(percentage),
+        func.max(percentage),
+        *bucket_counts
+    ).group_by(Score.quiz_id)
+
+    columns = ['quiz_id', 'attempts', 'score_sum', 'score_sq_sum', 'min_score', 'max_score'] + \
+        [f'bucket_{i}' for i in range(QuizStats.HISTOGRAM_BUCKETS)]
+    connection.execute(delete(QuizStats))
+    connection.execute(insert(QuizStats).from_select(columns, aggregates))
+
+
+@migration('backfill_quiz_stats')
+def backfill_quiz_stats(connection):
+    rebuild_quiz_stats(connection)
+
+
+RESULT_PERCENTILES = (25, 50, 75, 90)
+
+
+def _percentile(percentage, filters, count, p):
+    """Linearly interpolated percentile, read with ORDER BY ... LIMIT 2 OFFSET in SQL."""
+    position = p / 100 * (count - 1)
+    lower = math.floor(position)
+    values = db.session.execute(
+        select(percentage).where(*filters).order_by(percentage).limit(2).offset(lower)
+    ).scalars().all()
+    if len(values) == 1 or position == lower:
+        return values[0]
+    return values[0] + (values[1] - values[0]) * (position - lower)
+
+
+def quiz_results_analytics(quiz_id, pass_percentage):
+    """Summary statistics over every attempt at ``quiz_id``, computed in SQL.
+
+    One aggregate query returns the count, mean, pass count and histogram;
+    each percentile is then a single ordered, offset lookup, so no score
+    rows are transferred to Python.
+    """
+    percentage = score_percentage_expr()
+    filters = [Score.quiz_id == quiz_id]
+    row = db.session.execute(
+        select(
+            func.count(Score.id),
+            func.avg(percentage),
+            func.coalesce(func.sum(case((percentage >= pass_percentage, 1), else_=0)), 0),
+            *histogram_bucket_counts(percentage)
+        ).where(*filters)
+    ).one()
+    count, mean, passed = row[0], row[1], row[2]
+    histogram = [{'from': i * 10, 'to': i * 10 + 10, 'count': c} for i, c in enumerate(row[3:])]
+
+    percentiles = {}
+    if count:
+        percentiles = {f'p{p}': _percentile(percentage, filters, count, p) for p in RESULT_PERCENTILES}
+    return {
+        'attempts': count,
+        'mean_percentage': mean,
+        'median_percentage': percentiles.get('p50'),
+        'percentiles': percentiles,
+        'pass_percentage': pass_percentage,
+        'pass_rate': passed / count if count else None,
+        'histogram': histogram
+    }
@@ -1,168 +1,143 @@
-import csv
-import os
-from io import StringIO
-from datetime import datetime, timedelta, date 
-from celery import Celery
-from flask_mail import Mail, Message
-from models import db, User, Quiz, Score 
-from app import create_app 
-import os
-import csv
-from io import StringIO
 from datetime import datetime, timedelta, date
 
-from celery import Celery
-from flask_mail import Mail, Message
+from flask import current_app
+from flask_mail import Message
 
+from app import mail
+from celery_app import celery
+from config import Config
 from models import db, User, Quiz, Score
-from app import create_app
+from exports import run_export_job
+from reports import monthly_summaries, iter_monthly_details, render_monthly_report
+from mailer import build_message, iter_batches, send_batch
+from leaderboard import rebuild_leaderboards as rebuild_leaderboard_sets
+from score_queue import flush_pending_scores as flush_score_queue
 
 
-flask_app = create_app()
-
-celery = Celery(__name__, broker=flask_app.config['CELERY_BROKER_URL'])
-celery.conf.update(flask_app.config)
-
-mail = Mail(flask_app)
+@celery.task()
+def send_score_email(score_id):
+    score = db.session.get(Score, score_id)
+    if not score or not score.user or not score.quiz:
+        return "User, quiz, or score not found"
+
+    user = score.user
+    msg = Message('Quiz Score Notification',
+                  sender=current_app.config['MAIL_USERNAME'],
+                  recipients=[user.email])
+    msg.body = (
+        f"Hello {user.full_name or user.email},\n\n"
+        f"You have completed the quiz '{score.quiz.name}' and your score is "
+        f"{score.total_scored}/{score.total_possible}.\n\nThanks,\nQuiz Master Team"
+    )
+
+    try:
+        mail.send(msg)
+        return "Email sent successfully"
+    except Exception as e:
+        return f"Failed to send email: {str(e)}"
+
+
+@celery.task(bind=True, max_retries=Config.MAIL_MAX_RETRIES)
+def deliver_mail_batch(self, messages):
+    """Sends a batch of messages over one SMTP connection, retrying only the failures."""
+    failed = send_batch(mail, messages, current_app.config['MAIL_SEND_RATE'])
+    if not failed:
+        return f"Sent {len(messages)} messages."
+    if self.request.retries >= self.max_retries:
+        current_app.logger.error(f"Giving up on {len(failed)} messages: {', '.join(m['recipient'] for m in failed)}")
+        return f"Sent {len(messages) - len(failed)} messages, {len(failed)} failed."
+    countdown = current_app.config['MAIL_RETRY_BACKOFF'] * (2 ** self.request.retries)
+    raise self.retry(args=[failed], countdown=countdown)
+
+
+def dispatch_mail(messages):
+    """Fans ``messages`` out into deliver_mail_batch subtasks as batches fill up."""
+    batches = 0
+    for batch in iter_batches(messages, current_app.config['MAIL_BATCH_SIZE']):
+        deliver_mail_batch.delay(batch)
+        batches += 1
+    return batches
 
 
 @celery.task()
 def send_daily_reminders():
-    with flask_app.app_context():
-        seven_days_ago = datetime.utcnow() - timedelta(days=7)
+    seven_days_ago = datetime.utcnow() - timedelta(days=7)
+
+
+    inactive_users = User.query.filter(
+        User.role == 'user',
+        ~User.scores.any(Score.time_stamp_of_attempt > seven_days_ago) # Users with no score in last 7 days
+    ).all()
+
 
-        
-        inactive_users = User.query.filter(
-            User.role == 'user',
-            ~User.scores.any(Score.time_stamp_of_attempt > seven_days_ago) # Users with no score in last 7 days
-        ).all()
+    recent_quizzes = Quiz.query.filter(
+        Quiz.created_at > datetime.utcnow() - timedelta(days=1)
+    ).all()
 
-    
-        recent_quizzes = Quiz.query.filter(
-            Quiz.created_at > datetime.utcnow() - timedelta(days=1)
-        ).all()
+    if not inactive_users and not recent_quizzes:
+        current_app.logger.info("No reminders to send today.")
+        return "No reminders to send today."
 
-        if not inactive_users and not recent_quizzes:
-            print("No reminders to send today.")
-            return "No reminders to send today."
+    # The quiz listing is the same for every user, so build it once
+    quiz_listing = ""
+    if recent_quizzes:
+        quiz_listing += "\nHere are some new quizzes you might be interested in:\n"
+        for quiz in recent_quizzes:
+            quiz_listing += f"- {quiz.name} (Subject: {quiz.chapter.subject.name if quiz.chapter else 'N/A'}, Chapter: {quiz.chapter.name if quiz.chapter else 'N/A'})\n"
 
+    sender = current_app.config['MAIL_USERNAME']
+
+    def reminders():
         for user in inactive_users:
-            msg = Message('Quiz Master Daily Reminder',
-                          sender=flask_app.config['MAIL_USERNAME'],
-                          recipients=[user.email])
             body = f"Hello {user.full_name or user.email},\n\n"
             body += "Just a friendly reminder to visit Quiz Master!\n"
-
-            if recent_quizzes:
-                body += "\nHere are some new quizzes you might be interested in:\n"
-                for quiz in recent_quizzes:
-                    body += f"- {quiz.name} (Subject: {quiz.chapter.subject.name if quiz.chapter else 'N/A'}, Chapter: {quiz.chapter.name if quiz.chapter else 'N/A'})\n"
-
+            body += quiz_listing
             body += "\nKeep learning and happy quizzing!\n\nThanks,\nQuiz Master Team"
-            msg.body = body
+            yield build_message('Quiz Master Daily Reminder', user.email, sender, body=body)
 
-            try:
-                mail.send(msg)
-                print(f"Daily reminder sent to {user.email}")
-            except Exception as e:
-                print(f"Failed to send daily reminder to {user.email}: {str(e)}")
-        return "Daily reminders sent."
+    batches = dispatch_mail(reminders())
+    return f"Daily reminders queued in {batches} batches."
 
 
 @celery.task()
 def generate_monthly_report():
-    with flask_app.app_context():
-        # Calculate the start and end of the previous month
-        today = date.today()
-        first_day_of_current_month = today.replace(day=1)
-        last_day_of_previous_month = first_day_of_current_month - timedelta(days=1)
-        first_day_of_previous_month = last_day_of_previous_month.replace(day=1)
-
-        # Fetch all users
-        users = User.query.filter_by(role='user').all()
-
-        for user in users:
-            # Get scores for  previous month for this user
-            monthly_scores = Score.query.filter(
-                Score.user_id == user.id,
-                Score.time_stamp_of_attempt >= first_day_of_previous_month,
-                Score.time_stamp_of_attempt <= last_day_of_previous_month
-            ).all()
-
-            if not monthly_scores:
-                print(f"No activity for {user.email} last month. Skipping report.")
-                continue
-
-            total_quizzes_taken = len(monthly_scores)
-            total_scored_sum = sum(s.total_scored for s in monthly_scores)
-            total_possible_sum = sum(s.total_possible for s in monthly_scores)
-            average_score = (total_scored_sum / total_possible_sum * 100) if total_possible_sum > 0 else 0
-
-            # Generate HTML report
-            html_body = f"""
-            <html>
-            <head>
-                <style>
-                    body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                    .container {{ width: 80%; margin: 20px auto; padding: 20px; border: 1px solid #ddd; border-radius: 8px; background-color: #f9f9f9; }}
-                    h2 {{ color: #0056b3; }}
-                    table {{ width: 100%; border-collapse: collapse; margin-top: 20px; }}
-                    th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                    th {{ background-color: #e2e6ea; }}
-                    .summary {{ margin-top: 20px; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <h2>Monthly Activity Report - {first_day_of_previous_month.strftime('%B %Y')}</h2>
-                    <p>Dear {user.full_name or user.email},</p>
-                    <p>Here's a summary of your activity on Quiz Master for the month of {first_day_of_previous_month.strftime('%B %Y')}:</p>
-
-                    <div class="summary">
-                        <p><strong>Quizzes Taken:</strong> {total_quizzes_taken}</p>
-                        <p><strong>Average Score:</strong> {average_score:.2f}%</p>
-                        </div>
-
-                    <h3>Quiz Details:</h3>
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>Quiz Name</th>
-                                <th>Your Score</th>
-                                <th>Date Attempted</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-            """
-            for score in monthly_scores:
-                quiz = Quiz.query.get(score.quiz_id)
-                quiz_name = quiz.name if quiz else 'Unknown Quiz'
-                html_body += f"""
-                            <tr>
-                                <td>{quiz_name}</td>
-                                <td>{score.total_scored} / {score.total_possible}</td>
-                                <td>{score.time_stamp_of_attempt.strftime('%Y-%m-%d %H:%M')}</td>
-                            </tr>
-                """
-            html_body += """
-                        </tbody>
-                    </table>
-                    <p style="margin-top: 30px;">Keep up the great work!</p>
-                    <p>Thanks,</p>
-                    <p>Quiz Master Team</p>
-                </div>
-            </body>
-            </html>
-            """
-
-            msg = Message(f'Monthly Activity Report - {first_day_of_previous_month.strftime('%B %Y')}',
-                          sender=flask_app.config['MAIL_USERNAME'],
-                          recipients=[user.email])
-            msg.html = html_body # Send as HTML
-
-            try:
-                mail.send(msg)
-                print(f"Monthly report sent to {user.email}")
-            except Exception as e:
-                print(f"Failed to send monthly report to {user.email}: {str(e)}")
-        return "Monthly reports generated and sent."
\ No newline at end of file
+    # Calculate the start and end of the previous month
+    today = date.today()
+    first_day_of_current_month = today.replace(day=1)
+    last_day_of_previous_month = first_day_of_current_month - timedelta(days=1)
+    first_day_of_previous_month = last_day_of_previous_month.replace(day=1)
+    month_label = first_day_of_previous_month.strftime('%B %Y')
+
+    # One grouped query for the totals, one streamed detail query in user order
+    summaries = monthly_summaries(first_day_of_previous_month, first_day_of_current_month)
+    details = iter_monthly_details(first_day_of_previous_month, first_day_of_current_month)
+    sender = current_app.config['MAIL_USERNAME']
+
+    def reports():
+        for user, monthly_scores in details:
+            summary = summaries[user.user_id]
+            yield build_message(f'Monthly Activity Report - {month_label}', user.email, sender,
+                                html=render_monthly_report(user, summary, monthly_scores, month_label))
+
+    batches = dispatch_mail(reports())
+    return f"Monthly reports queued in {batches} batches."
+
+
+@celery.task()
+def export_scores_job(job_id):
+    job = run_export_job(job_id)
+    return job.status if job else "Export job not found"
+
+
+@celery.task()
+def rebuild_leaderboards():
+    boards = rebuild_leaderboard_sets()
+    if boards is None:
+        return "A leaderboard rebuild is already running."
+    return f"Rebuilt {boards} leaderboards."
+
+
+@celery.task()
+def flush_pending_scores():
+    flushed = flush_score_queue()
+    return f"Flushed {flushed} scores."
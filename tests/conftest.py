@@ -0,0 +1,84 @@
+import os
+
+# Config reads the environment at import time, so set it before importing the app
+os.environ['DATABASE_URL'] = 'sqlite://'
+os.environ['REDIS_URL'] = 'fakeredis://'
+os.environ['PASSWORD_HASH_WORKERS'] = '0'
+
+import pytest
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
+
+from app import create_app
+from models import db, User, Subject, Chapter, Quiz, Question
+from redis_store import get_redis
+
+
+@pytest.fixture(scope='session')
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def database(app):
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(email='admin@example.com', password=generate_password_hash('pw'), full_name='Admin', role='admin'))
+        db.session.add(User(email='user@example.com', password=generate_password_hash('pw'), full_name='User', role='user'))
+        db.session.commit()
+        yield db
+        db.session.remove()
+        db.drop_all()
+        get_redis().flushall()
+
+
+@pytest.fixture
+def client(app, database):
+    return app.test_client()
+
+
+def login(client, email):
+    response = client.post('/api/login', json={'email': email, 'password': 'pw'})
+    assert response.status_code == 200, response.data
+
+
+def seed_quizzes(count, chapters_per_subject=3, questions_per_quiz=2):
+    """``count`` quizzes spread over several chapters and subjects, each with a few questions."""
+    subjects = Subject.query.count()
+    for i in range(count):
+        if i % (chapters_per_subject * 5) == 0:
+            subject = Subject(name=f'Subject {subjects}')
+            subjects += 1
+            db.session.add(subject)
+            db.session.flush()
+        if i % 5 == 0:
+            chapter = Chapter(name=f'Chapter {i}', subject_id=subject.id)
+            db.session.add(chapter)
+            db.session.flush()
+        quiz = Quiz(name=f'Quiz {i}', chapter_id=chapter.id, time_duration='10')
+        db.session.add(quiz)
+        db.session.flush()
+        for j in range(questions_per_quiz):
+            db.session.add(Question(quiz_id=quiz.id, question_statement=f'Question {j}',
+                                    option1='a', option2='b', option3='c', option4='d', correct_option='a'))
+    db.session.commit()
+
+
+class QueryCounter:
+    """Counts the SQL statements executed on ``engine`` inside the ``with`` block."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self.count += 1
@@ -0,0 +1,42 @@
+from models import db, Subject, Chapter, Quiz, Score, User
+from leaderboard import REBUILD_LOCK_KEY, leaderboard_key, rebuild_leaderboards
+from redis_store import get_redis
+
+
+def seed_score():
+    subject = Subject(name='Science')
+    db.session.add(subject)
+    db.session.flush()
+    chapter = Chapter(name='Physics', subject_id=subject.id)
+    db.session.add(chapter)
+    db.session.flush()
+    quiz = Quiz(name='Motion', chapter_id=chapter.id, time_duration='10')
+    db.session.add(quiz)
+    db.session.flush()
+    user = User.query.filter_by(email='user@example.com').one()
+    db.session.add(Score(quiz_id=quiz.id, user_id=user.id, total_scored=4, total_possible=4))
+    db.session.commit()
+    return user.id, quiz.id, chapter.id, subject.id
+
+
+def test_rebuild_ignores_temp_keys_left_by_a_crashed_run(database):
+    user_id, quiz_id, chapter_id, subject_id = seed_score()
+    redis_client = get_redis()
+    redis_client.zadd(leaderboard_key('chapter', chapter_id) + ':rebuild', {user_id: 100.0})
+
+    assert rebuild_leaderboards() == 3
+    assert redis_client.zscore(leaderboard_key('quiz', quiz_id), user_id) == 100.0
+    assert redis_client.zscore(leaderboard_key('chapter', chapter_id), user_id) == 100.0
+    assert redis_client.zscore(leaderboard_key('subject', subject_id), user_id) == 100.0
+    assert not list(redis_client.scan_iter(match='leaderboard:*:rebuild'))
+    assert not redis_client.exists(REBUILD_LOCK_KEY)
+
+
+def test_rebuild_skips_while_another_rebuild_holds_the_lock(database):
+    seed_score()
+    redis_client = get_redis()
+    redis_client.set(REBUILD_LOCK_KEY, 'other-run')
+
+    assert rebuild_leaderboards() is None
+    assert not list(redis_client.scan_iter(match='leaderboard:*'))
+    assert redis_client.get(REBUILD_LOCK_KEY) == 'other-run'
@@ -0,0 +1,21 @@
+from werkzeug.security import generate_password_hash
+
+import routes
+from models import db, User
+from passwords import HashingBusy
+
+
+def test_login_succeeds_when_the_rehash_finds_the_pool_busy(client, monkeypatch):
+    user = User.query.filter_by(email='user@example.com').one()
+    outdated = generate_password_hash('pw', 'pbkdf2:sha256:1000')
+    user.password = outdated
+    db.session.commit()
+
+    def busy(password):
+        raise HashingBusy()
+    monkeypatch.setattr(routes, 'hash_password', busy)
+
+    response = client.post('/api/login', json={'email': 'user@example.com', 'password': 'pw'})
+    assert response.status_code == 200
+    db.session.expire_all()
+    assert User.query.filter_by(email='user@example.com').one().password == outdated
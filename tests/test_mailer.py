@@ -0,0 +1,31 @@
+import mailer
+from mailer import SharedRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_send_rate_is_shared_between_delivery_tasks(database, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(mailer.time, 'time', clock.time)
+    monkeypatch.setattr(mailer.time, 'sleep', clock.sleep)
+
+    first, second = SharedRateLimiter(3), SharedRateLimiter(3)
+    for limiter in (first, second, first):
+        limiter.wait()
+    assert clock.sleeps == []
+
+    # The window's allowance is used up by both tasks together
+    second.wait()
+    assert clock.sleeps == [1.0]
+    assert clock.now == 1001.0
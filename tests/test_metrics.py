@@ -0,0 +1,19 @@
+import pytest
+
+
+@pytest.fixture
+def metrics_token(app):
+    app.config['METRICS_TOKEN'] = 'sécret'
+    yield app.config['METRICS_TOKEN']
+    app.config['METRICS_TOKEN'] = ''
+
+
+def test_non_ascii_authorization_header_is_rejected_not_an_error(client, metrics_token):
+    response = client.get('/api/admin/metrics', headers={'Authorization': 'Bearer wrông'})
+    assert response.status_code == 403
+
+
+def test_non_ascii_token_is_accepted(client, metrics_token):
+    header = f'Bearer {metrics_token}'.encode('utf-8').decode('latin-1')
+    response = client.get('/api/admin/metrics', headers={'Authorization': header})
+    assert response.status_code == 200
@@ -0,0 +1,33 @@
+"""Listing endpoints must issue the same number of queries however many rows they return."""
+import pytest
+
+from models import db, Quiz
+from conftest import QueryCounter, login, seed_quizzes
+
+
+N = 10
+
+
+def count_queries(client, url):
+    with QueryCounter(db.engine) as counter:
+        response = client.get(url)
+    assert response.status_code == 200, response.data
+    return counter.count, response
+
+
+@pytest.mark.parametrize('email, url', [
+    ('user@example.com', '/api/quizzes?limit=200'),
+    ('admin@example.com', '/api/admin/quizzes?limit=200'),
+])
+def test_quiz_listing_query_count_is_constant(client, email, url):
+    login(client, email)
+
+    seed_quizzes(N)
+    small, response = count_queries(client, url)
+    assert len(response.json['quizzes']) == N
+
+    seed_quizzes(9 * N)
+    large, response = count_queries(client, url)
+    assert len(response.json['quizzes']) == Quiz.query.count() == 10 * N
+
+    assert large == small
@@ -0,0 +1,50 @@
+import pytest
+
+from models import db, Subject, Chapter, Quiz, Question
+from conftest import login
+
+
+@pytest.fixture
+def quiz_id(database):
+    subject = Subject(name='Science')
+    db.session.add(subject)
+    db.session.flush()
+    chapter = Chapter(name='Physics', subject_id=subject.id)
+    db.session.add(chapter)
+    db.session.flush()
+    quiz = Quiz(name='Motion', chapter_id=chapter.id, time_duration='10')
+    db.session.add(quiz)
+    db.session.commit()
+    return quiz.id
+
+
+def question(**overrides):
+    item = {'question_statement': 'Unit of force?', 'options': ['N', 'J', 'W', 'Pa'], 'correct_option': 'N'}
+    item.update(overrides)
+    return item
+
+
+def test_bulk_import_reports_every_invalid_row_and_writes_nothing(client, quiz_id):
+    login(client, 'admin@example.com')
+    items = [
+        question(),
+        question(options=[None, 'b', 'c', 'd'], correct_option='b'),
+        question(options=['', 'b', 'c', 'd'], correct_option='b'),
+        question(options=[1, 'b', 'c', 'd'], correct_option='b'),
+        question(options=['x' * 256, 'b', 'c', 'd'], correct_option='b'),
+        question(question_statement=['not', 'text']),
+        question(question_statement='   '),
+    ]
+    response = client.post(f'/api/admin/quizzes/{quiz_id}/questions/bulk', json=items)
+
+    assert response.status_code == 400
+    assert [error['row'] for error in response.json['errors']] == [1, 2, 3, 4, 5, 6]
+    assert Question.query.count() == 0
+
+
+def test_single_question_with_null_option_is_a_400(client, quiz_id):
+    login(client, 'admin@example.com')
+    response = client.post(f'/api/admin/quizzes/{quiz_id}/questions',
+                           json=question(options=[None, 'b', 'c', 'd'], correct_option='b'))
+    assert response.status_code == 400
+    assert response.json['message'] == 'Every option must be non-empty text'
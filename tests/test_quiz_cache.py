@@ -0,0 +1,50 @@
+"""Cached answer keys and attempt payloads must not outlive the quiz they were built for."""
+from models import db, Subject, Chapter
+from conftest import login
+
+
+def create_quiz(client, chapter_id, name, statement, options, correct_option):
+    response = client.post('/api/admin/quizzes', json={'name': name, 'chapter_id': chapter_id, 'time_duration': '10'})
+    assert response.status_code == 201, response.data
+    quiz_id = response.json['id']
+    response = client.post(f'/api/admin/quizzes/{quiz_id}/questions', json={
+        'question_statement': statement, 'options': options, 'correct_option': correct_option
+    })
+    assert response.status_code == 201, response.data
+    return quiz_id, response.json['id']
+
+
+def test_reused_quiz_id_does_not_hit_the_deleted_quizs_cache(app, client):
+    subject = Subject(name='Science')
+    db.session.add(subject)
+    db.session.flush()
+    chapter = Chapter(name='Physics', subject_id=subject.id)
+    db.session.add(chapter)
+    db.session.commit()
+
+    admin = app.test_client()
+    login(admin, 'admin@example.com')
+    login(client, 'user@example.com')
+
+    old_quiz, old_question = create_quiz(admin, chapter.id, 'Old', 'OLD question', ['a', 'b', 'c', 'd'], 'a')
+    old_etag = client.get(f'/api/quizzes/{old_quiz}/attempt').headers['ETag']
+    response = client.post(f'/api/quizzes/{old_quiz}/submit', json={'answers': {str(old_question): 'a'}})
+    assert response.json['score'] == 1
+
+    # Scores block deletion, so remove the attempt before deleting the quiz
+    db.session.execute(db.text('DELETE FROM score'))
+    db.session.commit()
+    assert admin.delete(f'/api/admin/questions/{old_question}').status_code == 200
+    assert admin.delete(f'/api/admin/quizzes/{old_quiz}').status_code == 200
+
+    new_quiz, new_question = create_quiz(admin, chapter.id, 'New', 'NEW question', ['w', 'x', 'y', 'z'], 'z')
+    assert new_quiz == old_quiz
+
+    response = client.get(f'/api/quizzes/{new_quiz}/attempt')
+    assert response.json['quiz_name'] == 'New'
+    assert [q['question_statement'] for q in response.json['questions']] == ['NEW question']
+    assert response.headers['ETag'] != old_etag
+
+    response = client.post(f'/api/quizzes/{new_quiz}/submit', json={'answers': {str(new_question): 'z'}})
+    assert response.json['score'] == 1
+    assert response.json['total_questions'] == 1
@@ -0,0 +1,30 @@
+from models import db, Subject, Chapter, Quiz
+from conftest import login
+
+
+def test_cached_history_picks_up_renamed_quiz_chapter_and_subject(app, client):
+    subject = Subject(name='Science')
+    db.session.add(subject)
+    db.session.flush()
+    chapter = Chapter(name='Physics', subject_id=subject.id)
+    db.session.add(chapter)
+    db.session.flush()
+    quiz = Quiz(name='Motion', chapter_id=chapter.id, time_duration='10')
+    db.session.add(quiz)
+    db.session.commit()
+
+    login(client, 'user@example.com')
+    assert client.post(f'/api/quizzes/{quiz.id}/submit', json={'answers': {}}).status_code == 200
+    history = client.get('/api/user/scores').json
+    assert (history[0]['quiz_name'], history[0]['chapter_name'], history[0]['subject_name']) == \
+        ('Motion', 'Physics', 'Science')
+
+    admin = app.test_client()
+    login(admin, 'admin@example.com')
+    assert admin.put(f'/api/admin/quizzes/{quiz.id}', json={'name': 'Kinematics'}).status_code == 200
+    assert admin.put(f'/api/admin/chapters/{chapter.id}', json={'name': 'Mechanics'}).status_code == 200
+    assert admin.put(f'/api/admin/subjects/{subject.id}', json={'name': 'Physical Science'}).status_code == 200
+
+    history = client.get('/api/user/scores').json
+    assert (history[0]['quiz_name'], history[0]['chapter_name'], history[0]['subject_name']) == \
+        ('Kinematics', 'Mechanics', 'Physical Science')
@@ -0,0 +1,38 @@
+"""Start a Celery worker for one profile in celeryconfig.WORKER_PROFILES.
+
+    python worker.py realtime
+    python worker.py exports --concurrency 4
+
+Any arguments after the profile name are passed on to ``celery worker``
+and override the profile's defaults.
+"""
+import sys
+
+from celery_app import celery
+from celeryconfig import WORKER_PROFILES
+
+
+def worker_argv(profile_name, extra_args=()):
+    profile = WORKER_PROFILES[profile_name]
+    return [
+        'worker',
+        '--queues', ','.join(profile['queues']),
+        '--concurrency', str(profile['concurrency']),
+        '--prefetch-multiplier', str(profile['prefetch_multiplier']),
+        '--hostname', f'{profile_name}@%h',
+        '--loglevel', 'INFO',
+        *extra_args,
+    ]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in WORKER_PROFILES:
+        print(f"usage: python worker.py {{{'|'.join(WORKER_PROFILES)}}} [celery worker options]")
+        return 2
+    celery.worker_main(worker_argv(argv[0], argv[1:]))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
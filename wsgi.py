@@ -0,0 +1,10 @@
+"""WSGI entry point for production servers: ``gunicorn -c gunicorn.conf.py wsgi:app``.
+
+Run ``flask --app wsgi setup-db`` once per deploy to create or upgrade the
+schema and the admin account and to rebuild the leaderboards; serving never
+touches the schema.
+"""
+from app import create_app
+
+
+app = create_app()